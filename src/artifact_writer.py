@@ -0,0 +1,126 @@
+"""
+Background artifact writer: file writes on a thread pool behind a
+    bounded queue, so the run loop only blocks when too many artifacts are
+    pending. Rendering is deferred to rendering.py instead
+"""
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from threading import BoundedSemaphore
+from time import perf_counter
+from typing import Callable, TypedDict
+
+from profiler import span
+
+MAX_PENDING = 16
+IO_WORKERS = 4
+
+
+class ArtifactWriteStats(TypedDict):
+    writes: int  # completed
+    failures: int
+    blocked_seconds: float  # run loop time spent waiting on a full queue
+    mean_latency: float  # submit to done
+    max_latency: float
+    busy_seconds: float  # summed time spent writing
+
+
+def _timed(function: Callable, *args):
+    """
+    Runs in the worker: returns the result with the write start and end
+        times, read from the future itself once it is done
+    """
+    start_time = perf_counter()
+    result = function(*args)
+    return result, start_time, perf_counter()
+
+
+def _traced_write(function: Callable, *args):
+    with span('artifact_write', function=function.__name__):
+        return function(*args)
+
+
+class ArtifactWriter:
+
+    def __init__(
+            self, max_pending: int = MAX_PENDING, io_workers: int = IO_WORKERS):
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix='artifact-writer')
+        self.pending = BoundedSemaphore(max_pending)
+        # (submit time, future): the stats come from the finished futures,
+        #   not from done callbacks, which may still be running after wait()
+        self.futures: list[tuple[float, Future]] = []
+        self.latencies: list[float] = []
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.writes = 0
+        self.failures = 0
+
+    def write(self, function: Callable, *args) -> Future:
+        """
+        Queues a file write (QASM, counts, CSV...) on the thread pool
+        """
+        start_time = perf_counter()
+        self.pending.acquire()  # backpressure: blocks while the queue is full
+        self.blocked_seconds += perf_counter() - start_time
+
+        submit_time = perf_counter()
+        try:
+            # copy_context: the write span nests under the caller's span
+            future = self.io_executor.submit(
+                _timed, copy_context().run, _traced_write, function, *args)
+        except BaseException:
+            self.pending.release()
+            raise
+
+        future.add_done_callback(lambda _: self.pending.release())
+        self.futures.append((submit_time, future))
+        return future
+
+    def flush(self) -> ArtifactWriteStats:
+        """
+        Waits for every queued artifact; re-raises the first failure
+        """
+        futures, self.futures = self.futures, []
+        with span('artifact_flush', pending=len(futures)):
+            wait([future for _, future in futures])
+        exceptions = []
+        for submit_time, future in futures:
+            if future.exception() is not None:
+                exceptions.append(future.exception())
+                continue
+            _, start_time, end_time = future.result()
+            self.latencies.append(end_time - submit_time)
+            self.busy_seconds += end_time - start_time
+        self.writes += len(futures) - len(exceptions)
+        self.failures += len(exceptions)
+        if exceptions:
+            raise exceptions[0]
+        latencies = self.latencies
+        return ArtifactWriteStats(
+            writes=self.writes,
+            failures=self.failures,
+            blocked_seconds=self.blocked_seconds,
+            mean_latency=sum(latencies) / len(latencies) if latencies else 0.0,
+            max_latency=max(latencies, default=0.0),
+            busy_seconds=self.busy_seconds)
+
+    def close(self):
+        self.io_executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'ArtifactWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if exc_info[0] is None:
+                self.flush()
+        finally:
+            self.close()
+
+
+def print_write_latency(stats: ArtifactWriteStats):
+    print(f'artifacts: {stats["writes"]} written ({stats["failures"]} failed), '
+          f'latency {stats["mean_latency"] * 1000:.0f}ms mean / '
+          f'{stats["max_latency"] * 1000:.0f}ms max, '
+          f'{stats["busy_seconds"]:.2f}s busy, '
+          f'{stats["blocked_seconds"]:.2f}s blocked')
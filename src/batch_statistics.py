@@ -0,0 +1,124 @@
+"""
+Vectorized two-sample tests over stacked count matrices (runs x outcomes)
+"""
+from typing import Tuple, TypedDict
+
+import numpy as np
+from scipy.stats import chi2, kstwobign
+
+from counts import Counts
+
+
+class BatchTestResult(TypedDict):
+    statistic: np.ndarray
+    pvalue: np.ndarray
+    corrected_pvalue: np.ndarray
+
+
+class BatchStatisticalTestsResults(TypedDict):
+    chi2_contingency: BatchTestResult
+    g_test: BatchTestResult
+    ks: BatchTestResult
+    dof: np.ndarray
+    tvd: np.ndarray
+    hellinger_fidelity: np.ndarray
+
+
+def stack_counts(pairs: list[Tuple[Counts, Counts]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stacks (expected, actual) Counts pairs into two runs x outcomes
+        matrices over the union of observed outcomes
+    """
+    all_counts = [c for pair in pairs for c in pair]
+    if all(c.is_dense for c in all_counts) \
+            and len({len(c.values) for c in all_counts}) == 1:
+        expected = np.stack([e.values for e, _ in pairs])
+        actual = np.stack([a.values for _, a in pairs])
+        observed = (expected.sum(axis=0) + actual.sum(axis=0)) > 0
+        return expected[:, observed], actual[:, observed]
+
+    nonzero = [c.nonzero() for c in all_counts]
+    outcomes = np.unique(np.concatenate([indices for indices, _ in nonzero]))
+    matrix = np.zeros((len(all_counts), len(outcomes)), dtype=np.uint64)
+    for row, (indices, values) in enumerate(nonzero):
+        matrix[row, np.searchsorted(outcomes, indices)] = values
+    return matrix[0::2], matrix[1::2]
+
+
+def adjust_pvalues(pvalues: np.ndarray, method: str = 'bh') -> np.ndarray:
+    """
+    Multiple-comparison correction: 'bonferroni' or 'bh' (Benjamini-Hochberg)
+    """
+    m = len(pvalues)
+    if method == 'bonferroni':
+        return np.minimum(pvalues * m, 1.0)
+    if method == 'bh':
+        order = np.argsort(pvalues)
+        ranked = pvalues[order] * m / np.arange(1, m + 1)
+        ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+        adjusted = np.empty(m)
+        adjusted[order] = np.minimum(ranked, 1.0)
+        return adjusted
+    raise ValueError(f'unknown correction method: {method}')
+
+
+def batch_stat_tests(
+        expected: np.ndarray, actual: np.ndarray,
+        correction: str = 'bh') -> BatchStatisticalTestsResults:
+    """
+    Runs, for every row pair at once, the chi-square contingency test
+        (Yates-corrected when dof == 1, as scipy's chi2_contingency), the
+        G-test, the two-sample KS test over the outcome order (asymptotic
+        p-value), total variation distance and Hellinger fidelity
+    """
+    observed = np.stack([expected, actual], axis=1).astype(np.float64)  # R x 2 x K
+    row_totals = observed.sum(axis=2, keepdims=True)
+    column_totals = observed.sum(axis=1, keepdims=True)
+    totals = row_totals.sum(axis=1, keepdims=True)
+    expected_frequencies = row_totals * column_totals / totals
+
+    used_columns = column_totals[:, 0, :] > 0
+    dof = np.maximum(used_columns.sum(axis=1) - 1, 0)
+
+    diff = observed - expected_frequencies
+    yates = (dof == 1)[:, None, None]
+    diff = np.where(yates, np.sign(diff) * np.maximum(np.abs(diff) - .5, 0), diff)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi2_terms = np.where(
+            expected_frequencies > 0, diff ** 2 / expected_frequencies, 0)
+        g_terms = np.where(
+            observed > 0, observed * np.log(observed / expected_frequencies), 0)
+    chi2_statistic = chi2_terms.sum(axis=(1, 2))
+    g_statistic = 2 * g_terms.sum(axis=(1, 2))
+    chi2_pvalue = chi2.sf(chi2_statistic, np.maximum(dof, 1))
+    g_pvalue = chi2.sf(g_statistic, np.maximum(dof, 1))
+
+    p = observed[:, 0, :] / row_totals[:, 0, :]
+    q = observed[:, 1, :] / row_totals[:, 1, :]
+    tvd = .5 * np.abs(p - q).sum(axis=1)
+    hellinger_fidelity = np.sqrt(p * q).sum(axis=1) ** 2
+
+    ks_statistic = np.abs(np.cumsum(p - q, axis=1)).max(axis=1)
+    n = row_totals[:, 0, 0]
+    m = row_totals[:, 1, 0]
+    ks_pvalue = kstwobign.sf(ks_statistic * np.sqrt(n * m / (n + m)))
+
+    def test_result(statistic, pvalue) -> BatchTestResult:
+        return BatchTestResult(
+            statistic=statistic, pvalue=pvalue,
+            corrected_pvalue=adjust_pvalues(pvalue, correction))
+
+    return BatchStatisticalTestsResults(
+        chi2_contingency=test_result(chi2_statistic, chi2_pvalue),
+        g_test=test_result(g_statistic, g_pvalue),
+        ks=test_result(ks_statistic, ks_pvalue),
+        dof=dof,
+        tvd=tvd,
+        hellinger_fidelity=hellinger_fidelity)
+
+
+def batch_stat_test_results(
+        pairs: list[Tuple[Counts, Counts]],
+        correction: str = 'bh') -> BatchStatisticalTestsResults:
+    expected, actual = stack_counts(pairs)
+    return batch_stat_tests(expected, actual, correction)
@@ -0,0 +1,198 @@
+"""
+SQLite catalog of stored results under experiments/: one indexed row per
+    result, recorded at write time and rebuildable from the
+    {name}.results.json files on disk
+"""
+import sqlite3
+from contextlib import closing
+from glob import glob
+from os import environ, makedirs
+from os.path import dirname, exists
+from pathlib import Path
+from sys import argv
+from typing import TypedDict
+
+from results_store import read_metadata
+
+DEFAULT_CATALOG_PATH = environ.get('CATALOG_PATH', 'experiments/catalog.sqlite')
+RESULTS_SUFFIX = '.results.json'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    file_name TEXT PRIMARY KEY,
+    run_folder TEXT NOT NULL,
+    experiment_id TEXT,
+    date TEXT,
+    scenario_id TEXT,
+    backend_name TEXT,
+    backend_fingerprint TEXT,
+    circuit_hash TEXT,
+    job_id TEXT,
+    shots INTEGER,
+    num_bits INTEGER,
+    time_taken REAL,
+    test_name TEXT,
+    statistic REAL,
+    pvalue REAL
+);
+CREATE INDEX IF NOT EXISTS results_experiment
+    ON results (experiment_id, backend_name, scenario_id, date);
+CREATE INDEX IF NOT EXISTS results_pvalue ON results (pvalue);
+CREATE INDEX IF NOT EXISTS results_circuit ON results (circuit_hash);
+'''
+
+
+class CatalogEntry(TypedDict):
+    file_name: str
+    run_folder: str
+    experiment_id: str | None
+    date: str | None
+    scenario_id: str | None
+    backend_name: str | None
+    backend_fingerprint: str | None
+    circuit_hash: str | None
+    job_id: str | None
+    shots: int | None
+    num_bits: int | None
+    time_taken: float | None
+    test_name: str | None
+    statistic: float | None
+    pvalue: float | None
+
+
+COLUMNS = list(CatalogEntry.__annotations__)
+
+
+def catalog_entry(file_name: str, metadata: dict) -> CatalogEntry:
+    """
+    The run folder is experiments/{date}/{experiment_id}/run-N: date and
+        experiment id come from the path unless the metadata has them
+    """
+    run_folder = dirname(file_name)
+    path_parts = Path(run_folder).parts  # os.sep separated, as glob returns
+    date, experiment_id = (path_parts[-3], path_parts[-2]) \
+        if len(path_parts) >= 3 else (None, None)
+    stat_test = metadata.get('stat_test') or {}
+    return CatalogEntry(
+        file_name=file_name,
+        run_folder=run_folder,
+        experiment_id=metadata.get('experiment_id', experiment_id),
+        date=date,
+        scenario_id=metadata.get('scenario_id'),
+        backend_name=metadata.get('backend_name'),
+        backend_fingerprint=metadata.get('backend_fingerprint'),
+        circuit_hash=metadata.get('circuit_hash'),
+        job_id=metadata.get('job_id'),
+        shots=metadata.get('shots'),
+        num_bits=metadata.get('num_bits'),
+        time_taken=metadata.get('time_taken'),
+        test_name=stat_test.get('name'),
+        statistic=stat_test.get('statistic'),
+        pvalue=stat_test.get('pvalue'))
+
+
+class RunCatalog:
+
+    path: str
+    schema_ready: bool
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH):
+        self.path = path
+        self.schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        makedirs(dirname(self.path) or '.', exist_ok=True)
+        # once per catalog, not per operation (again if the file was removed)
+        create_schema = not self.schema_ready or not exists(self.path)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        # WAL: concurrent experiments can write while others read
+        connection.execute('PRAGMA journal_mode=WAL')
+        if create_schema:
+            connection.executescript(SCHEMA)
+            self.schema_ready = True
+        return connection
+
+    def record(self, entries: list[CatalogEntry]):
+        """
+        Inserts the entries, replacing rows of the same result file
+        """
+        placeholders = ', '.join('?' * len(COLUMNS))
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                f'INSERT OR REPLACE INTO results ({", ".join(COLUMNS)}) '
+                f'VALUES ({placeholders})',
+                [[entry[column] for column in COLUMNS] for entry in entries])
+
+    def record_result(self, file_name: str, metadata: dict | None = None):
+        self.record([catalog_entry(
+            file_name, metadata or read_metadata(file_name))])
+
+    def query(
+            self, experiment_id: str | None = None,
+            backend_name: str | None = None, scenario_id: str | None = None,
+            max_pvalue: float | None = None, since: str | None = None,
+            until: str | None = None, **columns) -> list[CatalogEntry]:
+        """
+        Rows matching every given filter, e.g. query(
+            experiment_id='grover-9q', backend_name='fake_sherbrooke',
+            scenario_id='noisy', max_pvalue=.05); since/until are ISO dates
+        """
+        conditions, parameters = [], []
+        columns.update(
+            experiment_id=experiment_id, backend_name=backend_name,
+            scenario_id=scenario_id)
+        for column, value in columns.items():
+            if column not in COLUMNS:
+                raise ValueError(f'unknown catalog column: {column}')
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                parameters.append(value)
+        for condition, value in [
+                ('pvalue < ?', max_pvalue), ('date >= ?', since),
+                ('date <= ?', until)]:
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f'SELECT * FROM results {where} ORDER BY date, file_name',
+                parameters).fetchall()
+        return [CatalogEntry(**dict(row)) for row in rows]
+
+    def rebuild(self, experiments_folder: str = 'experiments') -> int:
+        """
+        Drops every row and re-indexes the results.json files on disk
+        """
+        entries = [
+            catalog_entry(
+                path[:-len(RESULTS_SUFFIX)],
+                read_metadata(path[:-len(RESULTS_SUFFIX)]))
+            for path in sorted(glob(
+                f'{experiments_folder}/**/*{RESULTS_SUFFIX}', recursive=True))
+        ]
+        with closing(self._connect()) as connection, connection:
+            connection.execute('DELETE FROM results')
+        self.record(entries)
+        return len(entries)
+
+
+default_catalog = RunCatalog()
+
+
+def main():
+    """
+    python catalog.py rebuild [experiments folder]
+    """
+    if argv[1:2] == ['rebuild']:
+        experiments_folder = argv[2] if len(argv) > 2 else 'experiments'
+        count = default_catalog.rebuild(experiments_folder)
+        print(f'{count} results indexed into {default_catalog.path}')
+    else:
+        print(main.__doc__)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Active-qubit compaction: remaps a transpiled (device-wide) circuit onto
+    the physical qubits it actually touches before simulating it
+"""
+from typing import TypedDict
+
+from qiskit import QuantumCircuit, QuantumRegister
+from qiskit.transpiler import CouplingMap
+from qiskit_aer import AerSimulator
+from qiskit_ibm_runtime.ibm_backend import Backend
+
+from noise_cache import NoiseModelCache, default_noise_cache
+
+IDLE_OPERATIONS = {'barrier', 'delay'}
+
+
+class CompactedCircuit(TypedDict):
+    circuit: QuantumCircuit
+    active_qubits: list[int]  # physical qubit of each compacted qubit
+
+
+def active_qubits(circuit: QuantumCircuit) -> list[int]:
+    """
+    Returns the sorted physical qubits touched by a non-idle instruction
+    """
+    qubits = set()
+    for instruction in circuit.data:
+        if instruction.operation.name in IDLE_OPERATIONS:
+            continue
+        qubits.update(circuit.find_bit(q).index for q in instruction.qubits)
+    return sorted(qubits)
+
+
+def compact_circuit(circuit: QuantumCircuit) -> CompactedCircuit:
+    """
+    Rebuilds the circuit on its active qubits only; classical bits and
+        registers are kept, so counts are in the original bit order
+    """
+    physical_qubits = active_qubits(circuit)
+    compacted_index = {p: i for i, p in enumerate(physical_qubits)}
+
+    qubits = QuantumRegister(len(physical_qubits), 'q')
+    compacted = QuantumCircuit(
+        qubits, *circuit.cregs, name=circuit.name,
+        global_phase=circuit.global_phase)
+    for instruction in circuit.data:
+        indices = [circuit.find_bit(q).index for q in instruction.qubits]
+        if instruction.operation.name in IDLE_OPERATIONS:
+            indices = [i for i in indices if i in compacted_index]
+            if not indices:
+                continue
+        compacted.append(
+            instruction.operation,
+            [qubits[compacted_index[i]] for i in indices],
+            instruction.clbits)
+
+    return CompactedCircuit(circuit=compacted, active_qubits=physical_qubits)
+
+
+def restrict_coupling_map(
+        coupling_map: CouplingMap, physical_qubits: list[int]) -> CouplingMap:
+    compacted_index = {p: i for i, p in enumerate(physical_qubits)}
+    return CouplingMap([
+        [compacted_index[a], compacted_index[b]]
+        for a, b in coupling_map.get_edges()
+        if a in compacted_index and b in compacted_index
+    ])
+
+
+def used_gates(circuit: QuantumCircuit) -> set[str]:
+    return set(circuit.count_ops())
+
+
+def compacted_simulator(
+        backend: Backend, physical_qubits: list[int],
+        ideal: bool = False, gates: set[str] | None = None,
+        noise_cache: NoiseModelCache = default_noise_cache) -> AerSimulator:
+    """
+    Returns a simulator sized to the active qubits, with the backend
+        coupling and (unless ideal) its noise restricted to those qubits
+        and, if given, to the gates the circuit uses
+    """
+    coupling_map = restrict_coupling_map(backend.coupling_map, physical_qubits)
+    if ideal:
+        return AerSimulator(method='statevector', coupling_map=coupling_map)
+    noise_model = noise_cache.restricted_noise_model(
+        backend, physical_qubits, gates)
+    return AerSimulator(noise_model=noise_model, coupling_map=coupling_map)
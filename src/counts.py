@@ -0,0 +1,183 @@
+"""
+Array-backed measurement counts indexed by integer outcome
+"""
+from typing import Iterator, Tuple
+
+import numpy as np
+
+DENSE_MAX_BITS = 20  # above it, counts are stored sparse (indices + values)
+
+
+def bit_array_outcomes(bit_array) -> np.ndarray:
+    """
+    Decodes a SamplerV2 BitArray (big-endian packed bytes per shot) into
+        one integer outcome per shot
+    """
+    packed = bit_array.array.reshape(-1, bit_array.array.shape[-1])
+    num_bytes = packed.shape[1]
+    if num_bytes > 8:
+        raise ValueError(f'{bit_array.num_bits} bits do not fit in uint64')
+    padded = np.zeros((packed.shape[0], 8), dtype=np.uint8)
+    padded[:, 8 - num_bytes:] = packed
+    return padded.view('>u8').ravel().astype(np.uint64)
+
+
+class Counts:
+    """
+    Outcomes are uint64: at most 64 measured bits (ValueError above)
+    """
+
+    num_bits: int
+    indices: np.ndarray | None  # sparse only: sorted outcomes
+    values: np.ndarray
+
+    def __init__(
+            self, num_bits: int, values: np.ndarray,
+            indices: np.ndarray | None = None) -> None:
+        self.num_bits = num_bits
+        self.values = values
+        self.indices = indices
+
+    @property
+    def is_dense(self) -> bool:
+        return self.indices is None
+
+    @property
+    def shots(self) -> int:
+        return int(self.values.sum())
+
+    @classmethod
+    def from_outcomes(cls, outcomes: np.ndarray, num_bits: int) -> 'Counts':
+        """
+        Counts one integer outcome per shot
+        """
+        if num_bits <= DENSE_MAX_BITS:
+            values = np.bincount(
+                outcomes.astype(np.int64), minlength=1 << num_bits)
+            return cls(num_bits, values.astype(np.uint64))
+        indices, values = np.unique(outcomes, return_counts=True)
+        return cls(
+            num_bits, values.astype(np.uint64), indices.astype(np.uint64))
+
+    @classmethod
+    def from_sparse(
+            cls, indices: np.ndarray, values: np.ndarray,
+            num_bits: int) -> 'Counts':
+        """
+        Sums the values of repeated indices (e.g. '01' and '001' keys, or
+            the concatenated outcomes of two Counts)
+        """
+        indices, inverse = np.unique(
+            np.asarray(indices, dtype=np.uint64), return_inverse=True)
+        summed = np.zeros(len(indices), dtype=np.uint64)
+        np.add.at(summed, inverse.ravel(), np.asarray(values, dtype=np.uint64))
+        if num_bits <= DENSE_MAX_BITS:
+            dense = np.zeros(1 << num_bits, dtype=np.uint64)
+            dense[indices.astype(np.int64)] = summed
+            return cls(num_bits, dense)
+        return cls(num_bits, summed, indices)
+
+    @classmethod
+    def from_dict(cls, counts: dict, num_bits: int | None = None) -> 'Counts':
+        """
+        From get_counts() bitstrings ('0110', register spaces allowed) or
+            Aer's hex keys ('0x6')
+        """
+        keys = list(counts)
+        if keys and str(keys[0]).startswith('0x'):
+            outcomes = [int(k, 16) for k in keys]
+            if num_bits is None:
+                num_bits = max(max(outcomes).bit_length(), 1)
+        else:
+            bitstrings = [k.replace(' ', '') for k in keys]
+            outcomes = [int(k, 2) for k in bitstrings]
+            if num_bits is None:
+                num_bits = max((len(k) for k in bitstrings), default=1)
+        widest = max((o.bit_length() for o in outcomes), default=0)
+        if max(num_bits, widest) > 64:
+            raise ValueError(
+                f'{max(num_bits, widest)} bits do not fit in uint64')
+        indices = np.array(outcomes, dtype=np.uint64)
+        values = np.array(list(counts.values()), dtype=np.uint64)
+        return cls.from_sparse(indices, values, num_bits)
+
+    @classmethod
+    def from_bit_array(cls, bit_array) -> 'Counts':
+        return cls.from_outcomes(bit_array_outcomes(bit_array), bit_array.num_bits)
+
+    @classmethod
+    def from_result(cls, result, experiment: int = 0) -> 'Counts':
+        """
+        From an Aer Result (raw hex counts, no bitstring formatting) or
+            anything with get_counts() (MockResult, ExactResult)
+        """
+        if isinstance(result, Counts):
+            return result
+        if hasattr(result, 'data') and hasattr(result, 'results'):
+            header = result.results[experiment].header
+            num_bits = getattr(header, 'memory_slots', None)
+            return cls.from_dict(result.data(experiment)['counts'], num_bits)
+        return cls.from_dict(result.get_counts())
+
+    def nonzero(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (outcomes, counts) for observed outcomes, sorted by outcome
+        """
+        if self.is_dense:
+            indices = np.flatnonzero(self.values).astype(np.uint64)
+            return indices, self.values[indices.astype(np.int64)]
+        mask = self.values > 0
+        return self.indices[mask], self.values[mask]
+
+    def __add__(self, other: 'Counts') -> 'Counts':
+        if self.is_dense and other.is_dense \
+                and len(self.values) == len(other.values):
+            return Counts(self.num_bits, self.values + other.values)
+        self_indices, self_values = self.nonzero()
+        other_indices, other_values = other.nonzero()
+        return Counts.from_sparse(
+            np.concatenate([self_indices, other_indices]),
+            np.concatenate([self_values, other_values]),
+            max(self.num_bits, other.num_bits))
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        """
+        Yields (bitstring, count) pairs lazily, sorted by outcome
+        """
+        indices, values = self.nonzero()
+        for i, v in zip(indices, values):
+            yield format(int(i), f'0{self.num_bits}b'), int(v)
+
+    def to_dict(self) -> dict[str, int]:
+        return dict(self.items())
+
+    def get_counts(self) -> dict[str, int]:
+        """
+        Result-like access, so Counts can stand in for a Result
+        """
+        return self.to_dict()
+
+
+def align(expected: Counts, actual: Counts) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns both count vectors over the outcomes observed in either one,
+        sorted by integer outcome
+    """
+    if expected.is_dense and actual.is_dense \
+            and len(expected.values) == len(actual.values):
+        mask = (expected.values > 0) | (actual.values > 0)
+        return expected.values[mask], actual.values[mask]
+
+    expected_indices, expected_values = expected.nonzero()
+    actual_indices, actual_values = actual.nonzero()
+    outcomes = np.union1d(expected_indices, actual_indices)
+    expected_data = np.zeros(len(outcomes), dtype=np.uint64)
+    actual_data = np.zeros(len(outcomes), dtype=np.uint64)
+    expected_data[np.searchsorted(outcomes, expected_indices)] = expected_values
+    actual_data[np.searchsorted(outcomes, actual_indices)] = actual_values
+    return expected_data, actual_data
+
+
+def align_results(expected_result, actual_result) -> Tuple[np.ndarray, np.ndarray]:
+    return align(
+        Counts.from_result(expected_result), Counts.from_result(actual_result))
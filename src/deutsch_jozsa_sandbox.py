@@ -1,7 +1,6 @@
 """
 Deutsch-Jozsa Algorithm Circuit
 """
-from numpy import array as numpy_array
 from qiskit import QuantumCircuit, ClassicalRegister, QuantumRegister, transpile
 from qiskit_aer import AerSimulator
 from qiskit_ibm_runtime.fake_provider.backends import FakeTorino
@@ -9,6 +8,7 @@ from qiskit_ibm_runtime.ibm_backend import Backend
 from scipy.stats import ks_2samp, mannwhitneyu, shapiro
 
 import utils
+from counts import align_results
 from experiments_engine import run_experiment
 from gates import n_hadamard
 
@@ -116,7 +116,6 @@ def run_testing_experiments():
         'backend': simulator
     }
     ideal_result = run_experiment(**ideal_experiment)
-    ideal_result_counts: dict = ideal_result.get_counts()
 
     noisy_experiment = {
         'experiment_id': 'deutsch-jozsa.noisy',
@@ -124,20 +123,9 @@ def run_testing_experiments():
         'backend': backend
     }
     noisy_result = run_experiment(**noisy_experiment)
-    noisy_result_counts: dict = noisy_result.get_counts()
-
-    observed_outputs = set(
-        list(ideal_result_counts.keys()) +
-        list(noisy_result_counts.keys())
-    )
-
-    ideal_experiment_data: list[int] = []
-    noisy_experiment_data: list[int] = []
-    for o in observed_outputs:
-        ideal_experiment_data.append(ideal_result_counts.get(o, 0))
-        noisy_experiment_data.append(noisy_result_counts.get(o, 0))
-    ideal_experiment_data = numpy_array(ideal_experiment_data)
-    noisy_experiment_data = numpy_array(noisy_experiment_data)
+
+    ideal_experiment_data, noisy_experiment_data = align_results(
+        ideal_result, noisy_result)
     
     # test if it's a normal distribution
     # Shapiro H0: the data is normally distributed
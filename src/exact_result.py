@@ -0,0 +1,85 @@
+"""
+Exact (noise-free) output distribution of a circuit via Statevector,
+    with multinomial sampling only when counts are asked for
+"""
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+
+from compaction import compact_circuit
+
+ZERO_TOLERANCE = 1e-12  # below it, a probability is float noise
+
+
+def measured_qubits(circuit: QuantumCircuit) -> dict[int, int]:
+    """
+    Returns {clbit index: measured qubit index}
+    """
+    return {
+        circuit.find_bit(instruction.clbits[0]).index:
+            circuit.find_bit(instruction.qubits[0]).index
+        for instruction in circuit.data
+        if instruction.operation.name == 'measure'
+    }
+
+
+def exact_probabilities(circuit: QuantumCircuit) -> dict[str, float]:
+    """
+    Returns the probability of each classical outcome (bitstring keys as
+        in get_counts(), zeros omitted); measurements must be final
+    """
+    circuit = compact_circuit(circuit)['circuit']
+    clbit_to_qubit = measured_qubits(circuit)
+    clbits = sorted(clbit_to_qubit)
+    statevector = Statevector(circuit.remove_final_measurements(inplace=False))
+    probabilities = statevector.probabilities(
+        qargs=[clbit_to_qubit[c] for c in clbits])
+
+    # scatter the measured bits back into their clbit positions
+    outcomes = np.zeros(len(probabilities), dtype=np.int64)
+    indices = np.arange(len(probabilities), dtype=np.int64)
+    for bit, clbit in enumerate(clbits):
+        outcomes |= ((indices >> bit) & 1) << clbit
+
+    num_clbits = circuit.num_clbits
+    return {
+        format(int(outcome), f'0{num_clbits}b'): float(probability)
+        for outcome, probability in zip(outcomes, probabilities)
+        if probability > ZERO_TOLERANCE
+    }
+
+
+class ExactResult:
+
+    def __init__(
+            self, probabilities: dict[str, float], shots: int,
+            seed: int | None = None) -> None:
+        self.probabilities = probabilities
+        self.shots = shots
+        self.seed = seed
+        self.counts = None
+
+    @classmethod
+    def from_circuit(
+            cls, circuit: QuantumCircuit, shots: int,
+            seed: int | None = None) -> 'ExactResult':
+        return cls(exact_probabilities(circuit), shots, seed)
+
+    def get_probabilities(self) -> dict[str, float]:
+        return self.probabilities
+
+    def get_counts(self) -> dict[str, int]:
+        """
+        Samples shots from the exact distribution (once, then memoized)
+        """
+        if self.counts is None:
+            outcomes = list(self.probabilities)
+            p = np.array([self.probabilities[o] for o in outcomes])
+            sampled = np.random.default_rng(self.seed) \
+                .multinomial(self.shots, p / p.sum())
+            self.counts = {
+                outcome: int(count)
+                for outcome, count in zip(outcomes, sampled)
+                if count > 0
+            }
+        return self.counts
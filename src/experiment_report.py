@@ -1,9 +1,13 @@
-from typing import TypedDict, Tuple
+from typing import NotRequired, TypedDict, Tuple
 
 from qiskit.result.result import Result
 
+from replicates import ReplicateStatistics
+from sequential_test import SequentialTestResult
 from statistical_test import StatisticalTestsResultsByType
 
 class ExperimentReport(TypedDict):
     statistical_tests_results: StatisticalTestsResultsByType
     scenarios_results: Tuple[Result, Result]
+    sequential_tests_results: NotRequired[dict[str, SequentialTestResult]]
+    replicate_statistics: NotRequired[dict[str, ReplicateStatistics]]
@@ -0,0 +1,43 @@
+from qiskit.primitives.containers.primitive_result import PrimitiveResult
+
+
+class FakeRuntimeJob:
+
+    def __init__(
+            self, job_id: str, result: PrimitiveResult | None,
+            statuses: list[str] | None = None,
+            backend: str = 'fake_backend') -> None:
+        """
+        status() walks through statuses (QUEUED, RUNNING, DONE by default)
+            and then stays at the last one
+        """
+        self._job_id = job_id
+        self._result = result
+        self._backend = backend
+        self.statuses = statuses or ['QUEUED', 'RUNNING', 'DONE']
+        self.status_calls = 0
+
+    def job_id(self) -> str:
+        return self._job_id
+
+    def backend(self) -> str:
+        return self._backend
+
+    def status(self) -> str:
+        status = self.statuses[min(self.status_calls, len(self.statuses) - 1)]
+        self.status_calls += 1
+        return status
+
+    def result(self) -> PrimitiveResult:
+        return self._result
+
+
+class FakeRuntimeService:
+
+    def __init__(self, jobs: list[FakeRuntimeJob]) -> None:
+        self.jobs = {job.job_id(): job for job in jobs}
+        self.job_calls = 0
+
+    def job(self, job_id: str) -> FakeRuntimeJob:
+        self.job_calls += 1
+        return self.jobs[job_id]
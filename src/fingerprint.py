@@ -0,0 +1,60 @@
+"""
+Stable fingerprints for backends and circuits, used as cache and catalog keys
+"""
+from hashlib import sha256
+
+from qiskit import QuantumCircuit
+from qiskit_ibm_runtime.ibm_backend import Backend
+
+
+def calibration_timestamp(backend: Backend) -> str | None:
+    """
+    Returns the ISO timestamp of the backend calibration data, if it has one
+    """
+    properties = getattr(backend, 'properties', None)
+    if properties is None:
+        return None
+    try:
+        backend_properties = properties()
+    except Exception:  # simulators raise or return None
+        return None
+    last_update_date = getattr(backend_properties, 'last_update_date', None)
+    if last_update_date is None:
+        return None
+    return last_update_date.isoformat()
+
+
+def backend_fingerprint(backend: Backend) -> str:
+    """
+    Hashes what transpilation depends on: name, width, basis gates,
+        coupling map and calibration timestamp
+    """
+    digest = sha256()
+    digest.update(str(backend.name).encode())
+    digest.update(str(backend.num_qubits).encode())
+
+    target = getattr(backend, 'target', None)
+    if target is not None:
+        digest.update(','.join(sorted(target.operation_names)).encode())
+    coupling_map = getattr(backend, 'coupling_map', None)
+    if coupling_map is not None:
+        edges = sorted(tuple(edge) for edge in coupling_map.get_edges())
+        digest.update(str(edges).encode())
+
+    digest.update(str(calibration_timestamp(backend)).encode())
+    return digest.hexdigest()
+
+
+def circuit_hash(circuit: QuantumCircuit) -> str:
+    """
+    Hashes the circuit instructions (gate names, params and operands)
+    """
+    digest = sha256()
+    digest.update(f'{circuit.num_qubits},{circuit.num_clbits}'.encode())
+    for instruction in circuit.data:
+        qubits = [circuit.find_bit(q).index for q in instruction.qubits]
+        clbits = [circuit.find_bit(c).index for c in instruction.clbits]
+        params = [str(p) for p in instruction.operation.params]
+        digest.update(
+            f'{instruction.operation.name}{params}{qubits}{clbits};'.encode())
+    return digest.hexdigest()
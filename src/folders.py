@@ -1,6 +1,9 @@
 from datetime import date
-from os import listdir
+from os import getpid, listdir, replace
 from pathlib import Path
+from threading import get_ident
+
+NEXT_RUN_HINT = '.next-run'
 
 
 def create_parent_folder(experiment_id: str) -> str:
@@ -10,16 +13,43 @@ def create_parent_folder(experiment_id: str) -> str:
     return path
 
 
+def _scan_next_run_index(path: str) -> int:
+    """
+    Fallback when there is no hint file: one scan, numeric order
+        (run-10 after run-9)
+    """
+    run_indices = [
+        int(folder[len('run-'):]) for folder in listdir(path)
+        if folder.startswith('run-') and folder[len('run-'):].isdigit()
+    ]
+    return max(run_indices, default=0) + 1
+
+
 def create_run_folder(path: str) -> str:
-    folders = sorted(listdir(path), reverse=True)
-    if len(folders) > 0:
-        run_index_str = folders[0][len('run-'):]
-        run_index = int(run_index_str) + 1
-    else:
-        run_index = 1
-    path = f'{path}/run-{run_index}'
-    Path(path).mkdir(parents=True, exist_ok=True)
-    return path
+    """
+    Allocates the next run-N folder: exclusive mkdir is atomic, so
+        concurrent writers retry with N + 1 instead of sharing a folder;
+        the hint file makes it O(1) in the number of existing runs
+    """
+    hint_path = Path(path) / NEXT_RUN_HINT
+    try:
+        run_index = int(hint_path.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        run_index = _scan_next_run_index(path)
+
+    while True:
+        run_folder_path = f'{path}/run-{run_index}'
+        try:
+            Path(run_folder_path).mkdir()
+            break
+        except FileExistsError:
+            run_index += 1
+
+    # a stale (lower) hint only costs retries, never a shared folder
+    tmp_hint_path = hint_path.with_suffix(f'.{getpid()}.{get_ident()}.tmp')
+    tmp_hint_path.write_text(str(run_index + 1), encoding='utf-8')
+    replace(tmp_hint_path, hint_path)
+    return run_folder_path
 
 
 def create_artifacts_folder(experiment_id: str):
@@ -1,9 +1,12 @@
 from os import environ
+from sys import argv
 
-from qiskit.primitives.containers.primitive_result import PrimitiveResult
 from qiskit_ibm_runtime import QiskitRuntimeService
 
-from utils import write_job_results_json, write_results_csv
+from folders import create_artifacts_folder
+from job_manager import fetch_results
+
+EXPERIMENT_ID = 'grover-5q-qhw'
 
 def main():
     api_token = environ.get('API_TOKEN')
@@ -13,13 +16,12 @@ def main():
         instance='ibm-q/open/main',
         token=api_token
     )
-    job_id = 'cvecm898w2g0008edp90'
-    job_result: PrimitiveResult = runtime_service.job(job_id).result()
-
-    pub_result = job_result[0].data.c0.get_counts()
+    # pending jobs come from the run folders' jobs.json; job ids given as
+    #   arguments (e.g. submitted before jobs were recorded) are added first
+    job_ids = argv[1:]
+    run_folder = create_artifacts_folder(EXPERIMENT_ID) if job_ids else None
 
-    write_job_results_json(pub_result, 'grover-5q-qhw')
-    write_results_csv(pub_result, 'grover-5q-qhw')
+    fetch_results(runtime_service, EXPERIMENT_ID, job_ids, run_folder)
 
 
 if __name__ == '__main__':
@@ -1,9 +1,12 @@
 from os import environ
+from sys import argv
 
-from qiskit.primitives.containers.primitive_result import PrimitiveResult
 from qiskit_ibm_runtime import QiskitRuntimeService
 
-from utils import write_job_results_json, write_results_csv
+from folders import create_artifacts_folder
+from job_manager import fetch_results
+
+EXPERIMENT_ID = 'grover-9q-qhw'
 
 def main():
     api_token = environ.get('API_TOKEN')
@@ -13,13 +16,13 @@ def main():
         instance='ibm-q/open/main',
         token=api_token
     )
-    job_id = 'cve91wqkmd100082dxjg'
-    job_result: PrimitiveResult = runtime_service.job(job_id).result()
+    # pending jobs come from the run folders' jobs.json; job ids given as
+    #   arguments (e.g. submitted before jobs were recorded) are added first
+    job_ids = argv[1:]
+    run_folder = create_artifacts_folder(EXPERIMENT_ID) if job_ids else None
 
-    pub_result = job_result[0].data.c0.get_counts()
+    fetch_results(runtime_service, EXPERIMENT_ID, job_ids, run_folder)
 
-    write_job_results_json(pub_result, 'grover-9q-qhw')
-    write_results_csv(pub_result, 'grover-9q-qhw')
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,214 @@
+"""
+Grover circuit construction and (cached) transpilation
+"""
+from functools import lru_cache
+from re import findall
+
+from qiskit import ClassicalRegister, QuantumCircuit, transpile
+from qiskit.circuit.library import GroverOperator, PhaseOracle
+from qiskit_algorithms import Grover, AmplificationProblem
+from qiskit.transpiler.passes.routing.algorithms import ApproximateTokenSwapper
+from qiskit_ibm_runtime.ibm_backend import Backend
+
+from fingerprint import backend_fingerprint
+from profiler import span
+from transpile_cache import TranspileCache, cache_key, default_cache
+from transpile_search import \
+    best_transpile, print_search_timings, transpile_to_target
+
+
+def count_variables(boolean_expr: str) -> int:
+    """
+    Counts the distinct variables of the expression, i.e. the oracle width,
+        without synthesizing the oracle
+    """
+    return len(set(findall(r'[A-Za-z_][A-Za-z0-9_]*', boolean_expr)))
+
+
+def optimal_iterations(boolean_expr: str, num_solutions: int) -> int:
+    return Grover.optimal_num_iterations(
+        num_solutions=num_solutions,
+        num_qubits=count_variables(boolean_expr))
+
+
+def marked_states_to_boolean_expr(marked_states: list[str]) -> str:
+    """
+    Converts bitstrings (q0 right-most, as in counts keys) into a DNF
+        boolean expression, e.g. ['11000'] -> '(~q0 & ~q1 & ~q2 & q3 & q4)'
+    """
+    terms = []
+    for state in marked_states:
+        literals = [
+            f'q{i}' if bit == '1' else f'~q{i}'
+            for i, bit in enumerate(reversed(state))
+        ]
+        terms.append('(' + ' & '.join(literals) + ')')
+    return ' | '.join(terms)
+
+
+@lru_cache(maxsize=None)
+def synthesize_oracle(boolean_expr: str) -> PhaseOracle:
+    """
+    Memoized PhaseOracle synthesis; callers must not mutate the result
+    """
+    with span('oracle_synthesis', boolean_expr=boolean_expr):
+        return PhaseOracle(boolean_expr)
+
+
+@lru_cache(maxsize=None)
+def amplification_problem(boolean_expr: str) -> AmplificationProblem:
+    """
+    Memoized AmplificationProblem; the Grover operator is built once
+        per expression and reused by every circuit construction
+    """
+    oracle = synthesize_oracle(boolean_expr)
+    with span('grover_operator', qubits=oracle.num_qubits):
+        return AmplificationProblem(
+            oracle, grover_operator=GroverOperator(oracle))
+
+
+def build_grover_circuit(boolean_expr: str, iterations: int) -> QuantumCircuit:
+    problem = amplification_problem(boolean_expr)
+    with span('grover_construction', iterations=iterations):
+        return Grover(iterations=iterations) \
+            .construct_circuit(problem, measurement=True)
+
+
+def get_transpiled_grover_circuit(
+        boolean_expr: str, num_solutions: int, backend: Backend,
+        optimization_level: int = 3, seed_transpiler: int | None = None,
+        cache: TranspileCache | None = default_cache,
+        num_seeds: int = 1) -> QuantumCircuit:
+    """
+    Returns the transpiled Grover circuit, skipping oracle synthesis and
+        transpilation when an equivalent circuit is cached (hits and
+        misses are counted in cache.stats).
+    With num_seeds > 1, seeds seed_transpiler..seed_transpiler+num_seeds-1
+        are transpiled in parallel and the best scored circuit is kept
+    """
+    iterations = optimal_iterations(boolean_expr, num_solutions)
+
+    def transpile_circuit() -> QuantumCircuit:
+        circuit = build_grover_circuit(boolean_expr, iterations)
+        with span('transpile', backend=backend.name, qubits=circuit.num_qubits,
+                  num_seeds=num_seeds):
+            if num_seeds > 1:
+                first_seed = seed_transpiler or 0
+                search_result = best_transpile(
+                    circuit, backend,
+                    seeds=list(range(first_seed, first_seed + num_seeds)),
+                    optimization_level=optimization_level)
+                print_search_timings(search_result)
+                return search_result['circuit']
+            return transpile_to_target(
+                circuit, backend.target, optimization_level, seed_transpiler)
+
+    if cache is None:
+        return transpile_circuit()
+
+    key = cache_key(
+        boolean_expr=boolean_expr,
+        iterations=iterations,
+        backend=backend_fingerprint(backend),
+        optimization_level=optimization_level,
+        seed_transpiler=seed_transpiler,
+        num_seeds=num_seeds)
+    return cache.get_or_transpile(key, transpile_circuit)
+
+
+def restore_layout_circuit(
+        transpiled_circuit: QuantumCircuit, backend: Backend) -> QuantumCircuit:
+    """
+    Returns the transpiled SWAP network that moves every virtual qubit
+        back from its final (routed) to its initial physical qubit
+    """
+    layout = transpiled_circuit.layout
+    initial = layout.initial_index_layout(filter_ancillas=True)
+    final = layout.final_index_layout(filter_ancillas=True)
+    mapping = {
+        final_qubit: initial_qubit
+        for initial_qubit, final_qubit in zip(initial, final)
+        if initial_qubit != final_qubit
+    }
+
+    num_qubits = transpiled_circuit.num_qubits
+    swaps_circuit = QuantumCircuit(num_qubits)
+    if mapping:
+        graph = backend.coupling_map.graph.to_undirected()
+        for qubit_a, qubit_b in ApproximateTokenSwapper(graph, seed=0).map(mapping):
+            swaps_circuit.swap(qubit_a, qubit_b)
+
+    return transpile(
+        swaps_circuit, backend=backend, optimization_level=1,
+        initial_layout=list(range(num_qubits)), routing_method='none')
+
+
+def transpile_grover_block(
+        problem: AmplificationProblem, backend: Backend,
+        optimization_level: int = 3, seed_transpiler: int | None = None,
+        initial_layout: list[int] | None = None) -> QuantumCircuit:
+    """
+    Transpiles one Grover operator followed by the SWAPs that undo its
+        routing permutation, so the block can be repeated back to back
+    """
+    block = transpile(
+        problem.grover_operator, backend=backend,
+        optimization_level=optimization_level,
+        seed_transpiler=seed_transpiler, initial_layout=initial_layout)
+    return block.compose(restore_layout_circuit(block, backend))
+
+
+def iteration_sweep_circuits(
+        problem: AmplificationProblem, block: QuantumCircuit,
+        max_iterations: int, backend: Backend) -> list[QuantumCircuit]:
+    """
+    Returns the measured circuits for k = 0..max_iterations Grover
+        iterations, each one the previous prefix plus one more block
+    """
+    initial_layout = block.layout.initial_index_layout(filter_ancillas=True)
+    prefix = transpile(
+        problem.state_preparation, backend=backend, optimization_level=1,
+        initial_layout=initial_layout)
+
+    objective_qubits = [initial_layout[q] for q in problem.objective_qubits]
+    circuits = []
+    for iterations in range(max_iterations + 1):
+        if iterations > 0:
+            prefix = prefix.compose(block)
+        circuit = prefix.copy(name=f'grover-k{iterations}')
+        measurement_cr = ClassicalRegister(len(objective_qubits), 'meas')
+        circuit.add_register(measurement_cr)
+        circuit.measure(objective_qubits, measurement_cr)
+        circuits.append(circuit)
+    return circuits
+
+
+def get_transpiled_iteration_sweep(
+        boolean_expr: str, max_iterations: int, backend: Backend,
+        optimization_level: int = 3, seed_transpiler: int | None = None,
+        initial_layout: list[int] | None = None,
+        cache: TranspileCache | None = default_cache) -> list[QuantumCircuit]:
+    """
+    Returns transpiled circuits for k = 0..max_iterations at the cost of
+        a single Grover operator transpilation (cached per backend layout)
+    """
+    problem = amplification_problem(boolean_expr)
+
+    def transpile_block() -> QuantumCircuit:
+        return transpile_grover_block(
+            problem, backend, optimization_level, seed_transpiler,
+            initial_layout)
+
+    if cache is None:
+        block = transpile_block()
+    else:
+        key = cache_key(
+            boolean_expr=boolean_expr,
+            grover_block=True,
+            backend=backend_fingerprint(backend),
+            optimization_level=optimization_level,
+            seed_transpiler=seed_transpiler,
+            initial_layout=initial_layout)
+        block = cache.get_or_transpile(key, transpile_block)
+
+    return iteration_sweep_circuits(problem, block, max_iterations, backend)
@@ -0,0 +1,353 @@
+from qiskit import QuantumCircuit
+from qiskit.result.result import Result
+from qiskit_ibm_runtime.ibm_backend import Backend
+from qiskit_ibm_runtime import RuntimeJobV2 as RuntimeJob
+
+import simplejson
+
+import utils
+from grover_circuit import \
+    get_transpiled_grover_circuit, get_transpiled_iteration_sweep, \
+    marked_states_to_boolean_expr
+from scenario import Scenario
+from transpile_cache import default_cache
+from runner import ConcurrentScenarioRunner, ScenarioRunner
+from sequential_test import SequentialScenarioRunner, SequentialTestResult
+from replicates import \
+    ReplicateStatistics, measure_throughput, print_throughput, \
+    run_replicate_statistics
+from shot_planner import fill_scenario_shots
+from exact_result import exact_probabilities
+from counts import Counts
+from results_store import result_metadata, update_metadata, write_counts
+from catalog import default_catalog
+from fingerprint import backend_fingerprint, circuit_hash
+from statistical_test import stat_test_results
+
+from artifact_writer import ArtifactWriter, print_write_latency
+from folders import create_artifacts_folder
+from rendering import record_circuit_render, record_histogram_render
+from job_manager import ingest_pub_results, update_job_record
+from submission import HardwareSubmission
+from profiler import \
+    current_span_id, default_profiler, export_chrome_trace, export_jsonl, \
+    span, traced
+from resource_usage import default_monitor, export_json, print_peak_usage
+
+from qiskit.qasm3 import dump as qasm3_dump
+
+
+def write_qasm(circuit: QuantumCircuit, file_name: str):
+    with open(file_name, 'w', encoding='utf-8') as file:
+        qasm3_dump(circuit, file)
+
+
+class GroverExperiment:
+
+    id: str
+    reference_backend: Backend
+    boolean_expr: str
+    num_solutions: int
+    transpiled_circuit: QuantumCircuit
+    scenarios: list[Scenario]
+    draw_circuit: bool
+    plot_histograms: bool
+    transpile_seeds: int
+    profile_root_ids: list[int]  # spans not yet exported (setup)
+
+    def __init__(
+        self, id: str, reference_backend: Backend,
+        scenarios: list[Scenario] | None = None,
+        boolean_expr: str | None = None,
+        marked_states: list[str] | None = None,
+        num_solutions: int | None = None,
+        draw_circuit: bool = False,
+        transpile_seeds: int = 1,
+        plot_histograms: bool = False):
+        """
+        Either boolean_expr (q0 top-most: least significant qubit) and
+            num_solutions, or the marked_states bitstrings must be given.
+        transpile_seeds > 1 transpiles that many seeds in parallel and
+            keeps the best layout. draw_circuit and plot_histograms record
+            render jobs, rendered later by rendering.py
+        """
+        if boolean_expr is None:
+            if not marked_states:
+                raise ValueError('boolean_expr or marked_states is required')
+            boolean_expr = marked_states_to_boolean_expr(marked_states)
+            num_solutions = num_solutions or len(marked_states)
+        if num_solutions is None:
+            raise ValueError('num_solutions is required with boolean_expr')
+
+        self.id = id
+        self.reference_backend = reference_backend
+        self.scenarios = scenarios or []
+        self.boolean_expr = boolean_expr
+        self.num_solutions = num_solutions
+        self.draw_circuit = draw_circuit
+        self.plot_histograms = plot_histograms
+        self.transpile_seeds = transpile_seeds
+        with span('experiment_setup', experiment_id=id):
+            self.profile_root_ids = [current_span_id()]
+            self.transpiled_circuit = self.get_transpiled_circuit()
+
+    @utils.print_exec_time
+    def get_transpiled_circuit(self) -> QuantumCircuit:
+        transpiled_circuit = get_transpiled_grover_circuit(
+            self.boolean_expr, self.num_solutions, self.reference_backend,
+            num_seeds=self.transpile_seeds)
+        print(f'transpile cache: {default_cache.stats}')
+        self.transpiled_circuit = transpiled_circuit
+        return transpiled_circuit
+
+    def write_circuit_artifacts(
+            self, artifacts_folder_path: str,
+            writer: ArtifactWriter | None = None):
+        """
+        With a writer, the QASM dump is queued in background; drawing is
+            only recorded as a render job (see rendering.render_pending)
+        """
+        circuit = self.transpiled_circuit
+        circuit_qasm_file_name = f'{artifacts_folder_path}/{self.id}.qasm'
+        if writer is None:
+            write_qasm(circuit, circuit_qasm_file_name)
+        else:
+            writer.write(write_qasm, circuit, circuit_qasm_file_name)
+
+        if self.draw_circuit:
+            record_circuit_render(
+                artifacts_folder_path, circuit,
+                f'{artifacts_folder_path}/{self.id}')
+
+    def plan_scenario_shots(
+            self, min_tvd: float = .05, alpha: float = .05,
+            power: float = .8, overwrite: bool = False) -> list[Scenario]:
+        """
+        Fills in the scenarios shots with the minimum that detects a TVD
+            of min_tvd from the ideal distribution with the given power
+        """
+        return fill_scenario_shots(
+            self.scenarios, exact_probabilities(self.transpiled_circuit),
+            min_tvd, alpha, power, overwrite)
+
+    def export_profile(self, artifacts_folder_path: str, run_span_id: int):
+        """
+        Moves the spans of the run (and of the setup, transpilation
+            included, on the first export) out of the profiler into
+            profile.jsonl and profile.trace.json (Chrome trace events),
+            and their memory / CPU usage into resources.json
+        """
+        spans = default_profiler.take_subtrees(
+            self.profile_root_ids + [run_span_id])
+        self.profile_root_ids = []
+        export_jsonl(spans, f'{artifacts_folder_path}/profile.jsonl')
+        export_chrome_trace(spans, f'{artifacts_folder_path}/profile.trace.json')
+        usage = default_monitor.take_records({s['span_id'] for s in spans})
+        export_json(usage, f'{artifacts_folder_path}/resources.json')
+        print_peak_usage(usage)
+
+    @utils.print_exec_time
+    def run_scenarios(self):
+        artifacts_folder_path = create_artifacts_folder(self.id)
+
+        runner = ConcurrentScenarioRunner(
+            circuit=self.transpiled_circuit,
+            scenarios=self.scenarios)
+        transpiled_circuit_hash = circuit_hash(self.transpiled_circuit)
+        results = {}
+        with span('experiment', experiment_id=self.id,
+                  run_folder=artifacts_folder_path):
+            run_span_id = current_span_id()
+            # artifacts are written in background while the next scenarios run
+            with ArtifactWriter() as writer:
+                self.write_circuit_artifacts(artifacts_folder_path, writer)
+                for scenario, runner_results in runner.run():
+                    results_file_name = \
+                        f'{artifacts_folder_path}/scenario-{scenario["id"]}'
+                    counts = Counts.from_result(runner_results)
+                    writer.write(write_counts, counts, results_file_name, {
+                        **result_metadata(runner_results),
+                        'experiment_id': self.id,
+                        'scenario_id': scenario['id'],
+                        'backend_name': scenario['backend'].name,
+                        'backend_fingerprint':
+                            backend_fingerprint(scenario['backend']),
+                        'circuit_hash': transpiled_circuit_hash,
+                    })
+                    writer.write(
+                        utils.write_results_csv, counts, results_file_name)
+                    if self.plot_histograms:
+                        record_histogram_render(
+                            artifacts_folder_path, results_file_name)
+                    results[results_file_name] = (scenario, runner_results)
+                print_write_latency(writer.flush())
+
+            self.catalog_results(results)
+        self.export_profile(artifacts_folder_path, run_span_id)
+
+    @traced('stats')
+    def catalog_results(
+            self, results: dict[str, tuple[Scenario, Result]],
+            reference_scenario_id: str = 'ideal'):
+        """
+        Tests every scenario against the reference one (if it ran) and
+            records the results into the catalog
+        """
+        reference_result = next((
+            result for scenario, result in results.values()
+            if scenario['id'] == reference_scenario_id), None)
+        for results_file_name, (scenario, result) in results.items():
+            metadata = None
+            if reference_result is not None \
+                    and scenario['id'] != reference_scenario_id:
+                test_name, test_result = next(iter(
+                    stat_test_results(reference_result, result).items()))
+                metadata = update_metadata(results_file_name, stat_test={
+                    'name': test_name,
+                    'statistic': float(test_result['statistic']),
+                    'pvalue': float(test_result['pvalue']),
+                })
+            default_catalog.record_result(results_file_name, metadata)
+
+    @utils.print_exec_time
+    def run_iteration_sweep(self, max_iterations: int):
+        """
+        Runs every scenario for k = 0..max_iterations Grover iterations
+        """
+        artifacts_folder_path = create_artifacts_folder(self.id)
+        circuits = get_transpiled_iteration_sweep(
+            self.boolean_expr, max_iterations, self.reference_backend)
+
+        for iterations, circuit in enumerate(circuits):
+            for scenario in self.scenarios:
+                runner = ScenarioRunner(circuit=circuit, scenario=scenario)
+                runner_results = runner.run()
+                results_file_name = \
+                    f'{artifacts_folder_path}/scenario-{scenario["id"]}.k-{iterations}'
+                utils.write_results_csv(
+                    Counts.from_result(runner_results), results_file_name)
+
+    @utils.print_exec_time
+    def run_sequential(
+            self, reference_scenario_id: str = 'ideal',
+            chunk_shots: int = 1000,
+            alpha: float = .05) -> dict[str, SequentialTestResult]:
+        """
+        Runs the reference scenario, then streams every other scenario in
+            chunks of shots until it is told apart from the reference (or
+            its shot budget runs out)
+        """
+        artifacts_folder_path = create_artifacts_folder(self.id)
+        self.write_circuit_artifacts(artifacts_folder_path)
+
+        reference_scenario = next(
+            s for s in self.scenarios if s['id'] == reference_scenario_id)
+        reference_result = ScenarioRunner(
+            circuit=self.transpiled_circuit,
+            scenario=reference_scenario).run()
+
+        sequential_tests_results = {}
+        for scenario in self.scenarios:
+            if scenario is reference_scenario:
+                continue
+            runner = SequentialScenarioRunner(
+                circuit=self.transpiled_circuit, scenario=scenario,
+                reference_result=reference_result,
+                chunk_shots=chunk_shots, alpha=alpha)
+            counts, sequential_test_result = runner.run()
+            print(f'scenario {scenario["id"]}: '
+                  f'{sequential_test_result["shots_used"]}/'
+                  f'{sequential_test_result["shots_budget"]} shots, '
+                  f'rejected H0: {sequential_test_result["rejected"]}')
+
+            results_file_name = f'{artifacts_folder_path}/scenario-{scenario["id"]}'
+            utils.write_results_csv(counts, results_file_name)
+            with open(f'{results_file_name}.sequential-test.json', 'w',
+                      encoding='utf-8') as file:
+                simplejson.dump(
+                    sequential_test_result, fp=file, indent=4, sort_keys=True)
+            sequential_tests_results[scenario['id']] = sequential_test_result
+
+        # the run span (print_exec_time's) is still open: its children are
+        #   exported
+        self.export_profile(artifacts_folder_path, current_span_id())
+        return sequential_tests_results
+
+    @utils.print_exec_time
+    def run_replicates(
+            self, replicates: int = 100, reference_scenario_id: str = 'ideal',
+            seed: int | None = None,
+            throughput: bool = False) -> dict[str, ReplicateStatistics]:
+        """
+        Runs R replicates of every scenario (one Aer job each) and stores
+            the distributions of the test statistics against the reference
+        """
+        artifacts_folder_path = create_artifacts_folder(self.id)
+        self.write_circuit_artifacts(artifacts_folder_path)
+
+        reference_scenario = next(
+            s for s in self.scenarios if s['id'] == reference_scenario_id)
+        replicate_statistics = {}
+        for scenario in self.scenarios:
+            if scenario is reference_scenario:
+                continue
+            statistics = run_replicate_statistics(
+                self.transpiled_circuit, reference_scenario, scenario,
+                replicates, seed)
+            print(f'scenario {scenario["id"]}: {replicates} replicates, '
+                  f'{statistics["replicates_per_second"]:.1f} replicates/s')
+            if throughput:
+                print_throughput(measure_throughput(
+                    self.transpiled_circuit, scenario, replicates, seed=seed))
+
+            results_file_name = f'{artifacts_folder_path}/scenario-{scenario["id"]}'
+            with open(f'{results_file_name}.replicates.json', 'w',
+                      encoding='utf-8') as file:
+                simplejson.dump(statistics, fp=file, indent=4, sort_keys=True)
+            replicate_statistics[scenario['id']] = statistics
+
+        # the run span (print_exec_time's) is still open: its children are
+        #   exported
+        self.export_profile(artifacts_folder_path, current_span_id())
+        return replicate_statistics
+
+    def add_to_submission(
+            self, submission: HardwareSubmission, shots: int = 10000,
+            replicates: int = 1, max_iterations: int | None = None) -> str:
+        """
+        Queues the circuit (replicates times) and, with max_iterations, the
+            k = 0..max_iterations sweep circuits into a hardware submission;
+            returns the run folder their results will be ingested into
+        """
+        artifacts_folder_path = create_artifacts_folder(self.id)
+        self.write_circuit_artifacts(artifacts_folder_path)
+
+        for replicate in range(replicates):
+            label = self.id if replicates == 1 else f'replicate-{replicate}'
+            submission.add(
+                self.id, artifacts_folder_path, self.transpiled_circuit,
+                shots, label)
+        if max_iterations is not None:
+            circuits = get_transpiled_iteration_sweep(
+                self.boolean_expr, max_iterations, self.reference_backend)
+            for iterations, circuit in enumerate(circuits):
+                submission.add(
+                    self.id, artifacts_folder_path, circuit, shots,
+                    f'k-{iterations}')
+        return artifacts_folder_path
+
+    def run_sampler(self, shots: int = 10000, wait: bool = False) -> RuntimeJob:
+        """
+        Submits the circuit to the reference backend (real QHW) via SamplerV2
+        """
+        submission = HardwareSubmission(self.reference_backend, mode='job')
+        self.add_to_submission(submission, shots)
+        # the job id goes to the run folder's jobs.json: fetch_results
+        #   ingests it later (see grover_*_qhw_fetch_results.py)
+        [(runtime_job, [job_record])] = submission.submit()
+
+        if wait:
+            ingest_pub_results(job_record, runtime_job.result())
+            update_job_record(job_record, status='DONE', ingested=True)
+
+        return runtime_job
@@ -0,0 +1,35 @@
+from submission import HardwareSubmission
+from grover_5q_qhw_experiment import Grover5qQhwExperiment
+from grover_9q_qhw_experiment import Grover9qQhwExperiment
+
+
+def main():
+    """
+    Puts the 5q and 9q experiments (plus their iteration sweeps) on
+        hardware as multi-PUB jobs of a single batch
+    """
+    from os import environ
+    from qiskit_ibm_runtime import QiskitRuntimeService
+
+    api_token = environ.get('API_TOKEN')
+    runtime_service = QiskitRuntimeService(
+        channel='ibm_quantum', token=api_token
+    )
+
+    reference_backend = runtime_service.backend(name='ibm_sherbrooke')
+
+    submission = HardwareSubmission(reference_backend, mode='batch')
+    Grover5qQhwExperiment(
+        id='grover-5q-qhw', reference_backend=reference_backend,
+    ).add_to_submission(submission, shots=10000, max_iterations=3)
+    Grover9qQhwExperiment(
+        id='grover-9q-qhw', reference_backend=reference_backend,
+    ).add_to_submission(submission, shots=10000, max_iterations=3)
+
+    for job, records in submission.submit():
+        print(f'job {job.job_id()}: '
+              f'{", ".join(r["run_folder"] for r in records)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+"""
+Runtime job manager: persists submitted job ids in the run folder and
+    polls many jobs concurrently (asyncio, with backoff), ingesting each
+    result as soon as its job is done
+"""
+import asyncio
+import os
+from datetime import datetime, timezone
+from glob import glob
+from typing import Callable, NotRequired, TypedDict
+
+import simplejson
+from qiskit.primitives.containers.primitive_result import PrimitiveResult
+
+from catalog import default_catalog
+from job_result_cache import \
+    MAX_CONCURRENCY, JobResultCache, default_job_result_cache
+from results_store import write_counts
+from shot_data import shot_counts, write_shots
+from utils import write_results_csv
+
+JOBS_FILE_NAME = 'jobs.json'
+FAILED_STATUSES = ('CANCELLED', 'ERROR')
+FINAL_STATUSES = ('DONE',) + FAILED_STATUSES
+
+
+class PubRecord(TypedDict):
+    index: int  # position of the PUB in the job
+    label: str
+
+
+class JobRecord(TypedDict):
+    job_id: str
+    experiment_id: str
+    run_folder: str
+    backend: str | None
+    submitted_at: str
+    status: str
+    ingested: bool
+    pubs: NotRequired[list[PubRecord]]  # multi-PUB jobs: this folder's PUBs
+    error: NotRequired[str | None]  # last fetch / ingest failure
+
+
+def status_name(status) -> str:
+    """
+    RuntimeJobV2.status() is a string, RuntimeJob.status() a JobStatus enum
+    """
+    return getattr(status, 'name', status)
+
+
+def load_job_records(run_folder: str) -> list[JobRecord]:
+    file_name = f'{run_folder}/{JOBS_FILE_NAME}'
+    if not os.path.exists(file_name):
+        return []
+    with open(file_name, encoding='utf-8') as file:
+        return simplejson.load(file)
+
+
+def save_job_records(run_folder: str, records: list[JobRecord]):
+    file_name = f'{run_folder}/{JOBS_FILE_NAME}'
+    tmp_file_name = f'{file_name}.tmp'
+    with open(tmp_file_name, 'w', encoding='utf-8') as file:
+        simplejson.dump(records, fp=file, indent=4, sort_keys=True)
+    os.replace(tmp_file_name, file_name)
+
+
+def record_job_id(
+        run_folder: str, job_id: str, experiment_id: str,
+        backend: str | None = None,
+        pubs: list[PubRecord] | None = None) -> JobRecord:
+    """
+    Appends the job to the run folder's jobs.json (no-op if already there)
+    """
+    records = load_job_records(run_folder)
+    for record in records:
+        if record['job_id'] == job_id:
+            return record
+    record = JobRecord(
+        job_id=job_id,
+        experiment_id=experiment_id,
+        run_folder=run_folder,
+        backend=backend,
+        submitted_at=datetime.now(timezone.utc).isoformat(),
+        status='QUEUED',
+        ingested=False)
+    if pubs is not None:
+        record['pubs'] = pubs
+    save_job_records(run_folder, records + [record])
+    return record
+
+
+def record_job(run_folder: str, job, experiment_id: str) -> JobRecord:
+    backend = job.backend()
+    backend_name = getattr(backend, 'name', backend)
+    return record_job_id(run_folder, job.job_id(), experiment_id, backend_name)
+
+
+def update_job_record(record: JobRecord, **fields) -> JobRecord:
+    record.update(fields)
+    records = load_job_records(record['run_folder'])
+    records = [
+        record if r['job_id'] == record['job_id'] else r for r in records]
+    save_job_records(record['run_folder'], records)
+    return record
+
+
+def find_pending_jobs(
+        experiment_id: str | None = None,
+        experiments_folder: str = 'experiments') -> list[JobRecord]:
+    """
+    Job records not yet ingested (nor failed or cancelled) across every
+        run folder; DONE ones too, in case fetching or ingesting their
+        result failed
+    """
+    pattern = f'{experiments_folder}/*/{experiment_id or "*"}/run-*'
+    return [
+        record
+        for run_folder in sorted(glob(pattern))
+        for record in load_job_records(run_folder)
+        if not record['ingested'] and record['status'] not in FAILED_STATUSES
+    ]
+
+
+def ingest_pub_results(record: JobRecord, result: PrimitiveResult):
+    """
+    Writes the per-shot packed bytes and counts of the record's PUBs
+        (every PUB by default) and classical registers into the run
+        folder, named after the experiment, job and PUB label
+    """
+    file_name = \
+        f'{record["run_folder"]}/{record["experiment_id"]}.{record["job_id"]}'
+    pubs = record.get('pubs') or [
+        PubRecord(index=i, label=record['experiment_id'] if i == 0 else f'pub-{i}')
+        for i in range(len(result))]
+    for pub in pubs:
+        pub_result = result[pub['index']]
+        for register, bit_array in pub_result.data.items():
+            suffix = '' if pub['label'] == record['experiment_id'] \
+                else f'.{pub["label"]}'
+            if len(pub_result.data) > 1:
+                suffix += f'.{register}'
+            write_shots(bit_array, f'{file_name}{suffix}')
+            counts = shot_counts(bit_array)
+            metadata = write_counts(counts, f'{file_name}{suffix}', {
+                'backend_name': record['backend'],
+                'job_id': record['job_id'],
+                'experiment_id': record['experiment_id'],
+                'scenario_id': pub['label'],
+            })
+            default_catalog.record_result(f'{file_name}{suffix}', metadata)
+            write_results_csv(counts, f'{file_name}{suffix}')
+
+
+class RuntimeJobManager:
+
+    def __init__(
+            self, service, poll_interval: float = 5.,
+            max_poll_interval: float = 120., backoff: float = 2.,
+            ingest: Callable[[JobRecord, PrimitiveResult], None] = ingest_pub_results,
+            cache: JobResultCache | None = None,
+            max_concurrency: int = MAX_CONCURRENCY):
+        """
+        service is a QiskitRuntimeService, or anything with job(job_id)
+            returning a job with status() and result(); at most
+            max_concurrency client calls are in flight at once
+        """
+        self.service = service
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.ingest = ingest
+        self.cache = cache or default_job_result_cache
+        self.max_concurrency = max_concurrency
+
+    async def _call(self, semaphore: asyncio.Semaphore, function, *args):
+        async with semaphore:
+            return await asyncio.to_thread(function, *args)
+
+    async def wait(
+            self, record: JobRecord,
+            semaphore: asyncio.Semaphore) -> PrimitiveResult | None:
+        """
+        Polls the job with exponential backoff; blocking client calls run in
+            threads so the other jobs keep polling meanwhile. Cached results
+            are returned without touching the service
+        """
+        cached_result = self.cache.get(record['job_id'])
+        if cached_result is not None:
+            update_job_record(record, status='DONE')
+            return cached_result
+
+        job = await self._call(semaphore, self.service.job, record['job_id'])
+        interval = self.poll_interval
+        while True:
+            status = status_name(await self._call(semaphore, job.status))
+            if status != record['status']:
+                update_job_record(record, status=status)
+            if status == 'DONE':
+                result = await self._call(semaphore, job.result)
+                self.cache.put(record['job_id'], result)
+                return result
+            if status in FINAL_STATUSES:
+                return None
+            await asyncio.sleep(interval)
+            interval = min(interval * self.backoff, self.max_poll_interval)
+
+    async def run(self, records: list[JobRecord]) -> list[JobRecord]:
+        """
+        Waits on every job at once and ingests results in completion order;
+            a multi-PUB job shared by several run folders is polled once
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        records_by_job: dict[str, list[JobRecord]] = {}
+        for record in records:
+            records_by_job.setdefault(record['job_id'], []).append(record)
+
+        async def wait_and_ingest(job_records: list[JobRecord]):
+            try:
+                result = await self.wait(job_records[0], semaphore)
+            except Exception as exception:  # pylint: disable=broad-except
+                for record in job_records:
+                    update_job_record(record, error=repr(exception))
+                raise
+            for record in job_records:
+                update_job_record(record, status=job_records[0]['status'])
+                if result is not None:
+                    try:
+                        # disk and catalog I/O: off the event loop
+                        await asyncio.to_thread(self.ingest, record, result)
+                    except Exception as exception:  # pylint: disable=broad-except
+                        update_job_record(record, error=repr(exception))
+                        raise
+                    update_job_record(record, ingested=True, error=None)
+                print(f'job {record["job_id"]} ({record["experiment_id"]}): '
+                      f'{record["status"]}')
+
+        # one failed job must not keep the others from being ingested:
+        #   failures are reported once every job is done
+        outcomes = await asyncio.gather(
+            *[wait_and_ingest(job_records)
+              for job_records in records_by_job.values()],
+            return_exceptions=True)
+        failures = [
+            (job_id, outcome)
+            for job_id, outcome in zip(records_by_job, outcomes)
+            if isinstance(outcome, BaseException)]
+        for job_id, exception in failures:
+            print(f'job {job_id} failed: {exception!r} (retried on the next '
+                  f'fetch_results)')
+        if failures:
+            raise failures[0][1]
+        return records
+
+
+def fetch_results(
+        service, experiment_id: str, job_ids: list[str] | None = None,
+        run_folder: str | None = None) -> list[JobRecord]:
+    """
+    Ingests every pending job of the experiment; job ids submitted outside
+        run_sampler can be registered into run_folder first
+    """
+    if job_ids and run_folder is None:
+        raise ValueError('job_ids need the run_folder to record them into')
+    for job_id in job_ids or []:
+        record_job_id(run_folder, job_id, experiment_id)
+    records = find_pending_jobs(experiment_id)
+    return asyncio.run(RuntimeJobManager(service).run(records))
@@ -0,0 +1,122 @@
+"""
+On-disk cache of runtime job results keyed by job id: the packed
+    measurement bytes of every PUB (npz), not JSON-dumped objects
+"""
+from concurrent.futures import ThreadPoolExecutor
+from os import environ, replace
+from pathlib import Path
+from tempfile import mkstemp
+from zipfile import BadZipFile
+
+import numpy as np
+import simplejson
+from qiskit.primitives.containers import BitArray, DataBin, SamplerPubResult
+from qiskit.primitives.containers.primitive_result import PrimitiveResult
+
+DEFAULT_CACHE_PATH = environ.get('JOB_RESULT_CACHE_PATH', '.cache/job-results')
+# requests' HTTPAdapter keeps 10 connections per host: more threads than
+#   that would queue on the runtime client's shared session anyway
+MAX_CONCURRENCY = 8
+
+
+def pack_result(result: PrimitiveResult) -> dict[str, np.ndarray]:
+    """
+    Flattens the result into arrays: pub-{i}.{register} holds the packed
+        bytes, pub-{i}.{register}.num_bits the bit count; metadata as JSON
+    """
+    arrays = {
+        'metadata': np.array(simplejson.dumps(result.metadata, default=str)),
+    }
+    for pub_index, pub_result in enumerate(result):
+        arrays[f'pub-{pub_index}.metadata'] = np.array(
+            simplejson.dumps(pub_result.metadata, default=str))
+        for register, bit_array in pub_result.data.items():
+            arrays[f'pub-{pub_index}.{register}'] = bit_array.array
+            arrays[f'pub-{pub_index}.{register}.num_bits'] = \
+                np.array(bit_array.num_bits)
+    return arrays
+
+
+def unpack_result(arrays) -> PrimitiveResult:
+    num_pubs = 1 + max(
+        (int(name.split('.')[0][len('pub-'):])
+         for name in arrays if name.startswith('pub-')), default=-1)
+    pub_results = []
+    for pub_index in range(num_pubs):
+        prefix = f'pub-{pub_index}.'
+        registers = [
+            name[len(prefix):] for name in arrays
+            if name.startswith(prefix)
+            and not name.endswith(('.num_bits', '.metadata'))]
+        data = DataBin(**{
+            register: BitArray(
+                arrays[f'{prefix}{register}'],
+                int(arrays[f'{prefix}{register}.num_bits']))
+            for register in registers
+        })
+        pub_results.append(SamplerPubResult(
+            data, simplejson.loads(str(arrays[f'{prefix}metadata']))))
+    return PrimitiveResult(
+        pub_results, simplejson.loads(str(arrays['metadata'])))
+
+
+class JobResultCache:
+
+    path: Path
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+
+    def _entry_path(self, job_id: str) -> Path:
+        return self.path / f'{job_id}.npz'
+
+    def __contains__(self, job_id: str) -> bool:
+        return self._entry_path(job_id).exists()
+
+    def get(self, job_id: str) -> PrimitiveResult | None:
+        entry_path = self._entry_path(job_id)
+        try:
+            with np.load(entry_path) as arrays:
+                return unpack_result(arrays)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, BadZipFile, KeyError, ValueError):
+            # truncated or corrupt entry: downloaded again and rewritten
+            entry_path.unlink(missing_ok=True)
+            return None
+
+    def put(self, job_id: str, result: PrimitiveResult):
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(job_id)
+        # a unique temp file per writer, then an atomic rename
+        tmp_file, tmp_path = mkstemp(dir=self.path, suffix='.tmp')
+        with open(tmp_file, 'wb') as file:
+            np.savez(file, **pack_result(result))
+        replace(tmp_path, entry_path)
+
+
+def fetch_job_results(
+        service, job_ids: list[str], cache: JobResultCache | None = None,
+        max_concurrency: int = MAX_CONCURRENCY) -> dict[str, PrimitiveResult]:
+    """
+    Returns the results of finished jobs by id: cached ones offline, the
+        rest downloaded by at most max_concurrency threads sharing the
+        service (and so its pooled HTTP session), then cached
+    """
+    cache = cache or default_job_result_cache
+    results = {job_id: cache.get(job_id) for job_id in job_ids}
+    missing = [job_id for job_id, result in results.items() if result is None]
+
+    def fetch(job_id: str) -> PrimitiveResult:
+        result = service.job(job_id).result()
+        cache.put(job_id, result)
+        return result
+
+    if missing:
+        with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(missing))) as executor:
+            results.update(zip(missing, executor.map(fetch, missing)))
+    return results
+
+
+default_job_result_cache = JobResultCache()
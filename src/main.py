@@ -12,8 +12,8 @@ def main():
     ideal_backend = AerSimulator.from_backend(reference_backend)
     ideal_backend.set_options(method='statevector', noise_model=None)
     scenarios = [
-        Scenario(id='noisy', backend=noisy_backend),
-        Scenario(id='ideal', backend=ideal_backend)
+        Scenario(id='noisy', backend=noisy_backend, compact=True),
+        Scenario(id='ideal', backend=ideal_backend, compact=True, ideal=True)
     ]
     grover_experiment = GroverStatExperiment(
         id='grover',
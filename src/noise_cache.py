@@ -0,0 +1,136 @@
+"""
+Noise models cached by backend name and calibration timestamp, with
+    versions restricted to the qubits and gates of a transpiled layout
+"""
+import pickle
+from hashlib import sha256
+from os import environ, replace
+from pathlib import Path
+from tempfile import mkstemp
+from typing import TypedDict
+
+from qiskit_aer.noise import NoiseModel
+from qiskit_aer.noise.device import \
+    basic_device_gate_errors, basic_device_readout_errors
+from qiskit_ibm_runtime.ibm_backend import Backend
+
+from fingerprint import calibration_timestamp
+from profiler import span
+
+DEFAULT_CACHE_PATH = environ.get('NOISE_CACHE_PATH', '.cache/noise-models')
+
+
+class DeviceErrors(TypedDict):
+    """
+    Errors are stored pickled and indexed by qubits, so a restricted
+        noise model only deserializes the errors it keeps
+    """
+    basis_gates: list[str]
+    readout_errors: dict[tuple, bytes]  # qubits -> ReadoutError
+    gate_errors: dict[tuple, dict[str, bytes]]  # qubits -> gate -> QuantumError
+
+
+def compute_device_errors(backend: Backend) -> DeviceErrors:
+    target = backend.target
+    readout_errors = {
+        tuple(qubits): pickle.dumps(error)
+        for qubits, error in basic_device_readout_errors(target=target)
+    }
+    gate_errors: dict[tuple, dict[str, bytes]] = {}
+    for name, qubits, error in basic_device_gate_errors(target=target):
+        gate_errors.setdefault(tuple(qubits), {})[name] = pickle.dumps(error)
+    return DeviceErrors(
+        basis_gates=list(backend.operation_names),
+        readout_errors=readout_errors,
+        gate_errors=gate_errors)
+
+
+class NoiseModelCache:
+
+    path: Path
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self._device_errors: dict[str, DeviceErrors] = {}
+        self._restricted: dict[tuple, NoiseModel] = {}
+
+    def key(self, backend: Backend) -> str:
+        content = f'{backend.name};{calibration_timestamp(backend)}'
+        return sha256(content.encode()).hexdigest()
+
+    def device_errors(self, backend: Backend) -> DeviceErrors:
+        """
+        Returns the device errors from memory, disk, or computes them
+            from the backend target (as NoiseModel.from_backend does)
+        """
+        key = self.key(backend)
+        if key in self._device_errors:
+            return self._device_errors[key]
+
+        entry_path = self.path / f'{key}.pickle'
+        try:
+            with open(entry_path, 'rb') as file:
+                device_errors = pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            device_errors = compute_device_errors(backend)
+            self.path.mkdir(parents=True, exist_ok=True)
+            # unique per writer: processes sharing the cache folder may
+            #   compute the same key at once
+            tmp_file, tmp_path = mkstemp(dir=self.path, suffix='.tmp')
+            with open(tmp_file, 'wb') as file:
+                pickle.dump(device_errors, file)
+            replace(tmp_path, entry_path)
+
+        self._device_errors[key] = device_errors
+        return device_errors
+
+    def noise_model(self, backend: Backend) -> NoiseModel:
+        device_errors = self.device_errors(backend)
+        return self.restricted_noise_model(
+            backend, list(range(backend.num_qubits)),
+            gates=set(device_errors['basis_gates']))
+
+    def restricted_noise_model(
+            self, backend: Backend, physical_qubits: list[int],
+            gates: set[str] | None = None) -> NoiseModel:
+        """
+        Keeps only the errors on the given qubits (remapped to their
+            index in physical_qubits) and, if given, on the given gates
+        """
+        memo_key = (
+            self.key(backend), tuple(physical_qubits),
+            frozenset(gates) if gates is not None else None)
+        if memo_key in self._restricted:
+            return self._restricted[memo_key]
+
+        with span('noise_model_build', backend=backend.name,
+                  qubits=len(physical_qubits)):
+            device_errors = self.device_errors(backend)
+            compacted_index = {p: i for i, p in enumerate(physical_qubits)}
+
+            def remap(qubits) -> list[int] | None:
+                if not all(q in compacted_index for q in qubits):
+                    return None
+                return [compacted_index[q] for q in qubits]
+
+            noise_model = NoiseModel(basis_gates=device_errors['basis_gates'])
+            if gates is None or 'measure' in gates:
+                for qubits, error in device_errors['readout_errors'].items():
+                    compacted_qubits = remap(qubits)
+                    if compacted_qubits is not None:
+                        noise_model.add_readout_error(
+                            pickle.loads(error), compacted_qubits)
+            for qubits, errors_by_gate in device_errors['gate_errors'].items():
+                compacted_qubits = remap(qubits)
+                if compacted_qubits is None:
+                    continue
+                for name, error in errors_by_gate.items():
+                    if gates is None or name in gates:
+                        noise_model.add_quantum_error(
+                            pickle.loads(error), name, compacted_qubits)
+
+        self._restricted[memo_key] = noise_model
+        return noise_model
+
+
+default_noise_cache = NoiseModelCache()
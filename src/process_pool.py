@@ -0,0 +1,15 @@
+"""
+Process pools for CPU-bound fan-out (transpiler seeds, resampling shards,
+    rendering)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+
+def spawn_pool(max_workers: int | None = None) -> ProcessPoolExecutor:
+    """
+    Workers start from a fresh interpreter (spawn): forking after Aer or
+        OpenMP threads have started can deadlock the child
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=get_context('spawn'))
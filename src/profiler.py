@@ -0,0 +1,199 @@
+"""
+Span-based profiler: nested timing spans (perf_counter_ns) with attributes,
+    exported as JSON lines or Chrome trace events (chrome://tracing,
+    Perfetto)
+"""
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from glob import glob
+from itertools import count
+from os import getpid
+from sys import argv
+from threading import Lock, get_ident
+from time import perf_counter_ns
+from typing import Callable, ContextManager, Iterator, TypedDict
+
+import simplejson
+
+# spans never exported (outside any experiment) are dropped oldest first
+MAX_SPANS = 100_000
+
+
+class SpanRecord(TypedDict):
+    name: str
+    span_id: int
+    parent_id: int | None
+    start_ns: int
+    duration_ns: int
+    pid: int
+    thread_id: int
+    attributes: dict
+
+
+class SpanSummary(TypedDict):
+    name: str
+    count: int
+    total_seconds: float
+    mean_seconds: float
+    max_seconds: float
+
+
+_current_span_id: ContextVar[int | None] = ContextVar(
+    'current_span_id', default=None)
+
+
+def current_span_id() -> int | None:
+    return _current_span_id.get()
+
+
+class Profiler:
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.spans: deque[SpanRecord] = deque(maxlen=max_spans)
+        self.lock = Lock()
+        self.span_ids = count(1)
+        # hook(span_id, name, attributes) context managers wrap every span
+        #   (see resource_usage.py)
+        self.hooks: list[Callable[[int, str, dict], ContextManager]] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[dict]:
+        """
+        Times the block as a child of the current span (per thread / task:
+            contextvars); yields the attributes, which the block may extend
+        """
+        span_id = next(self.span_ids)
+        parent_id = _current_span_id.get()
+        with ExitStack() as hooks:
+            for hook in self.hooks:
+                hooks.enter_context(hook(span_id, name, attributes))
+            token = _current_span_id.set(span_id)
+            start_ns = perf_counter_ns()
+            try:
+                yield attributes
+            finally:
+                duration_ns = perf_counter_ns() - start_ns
+                _current_span_id.reset(token)
+                with self.lock:
+                    self.spans.append(SpanRecord(
+                        name=name, span_id=span_id, parent_id=parent_id,
+                        start_ns=start_ns, duration_ns=duration_ns,
+                        pid=getpid(), thread_id=get_ident(),
+                        attributes=attributes))
+
+    def traced(self, name: str | None = None, **attributes):
+        """
+        Decorator: runs the function inside a span named after it
+        """
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name or function.__name__, **attributes):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def take_subtrees(self, root_span_ids: list[int]) -> list[SpanRecord]:
+        """
+        Removes and returns the finished spans under the given roots
+            (roots included), in start order: spans of other experiments
+            running in the process are left alone
+        """
+        with self.lock:
+            children: dict[int | None, list[int]] = {}
+            for span_record in self.spans:
+                children.setdefault(span_record['parent_id'], []).append(
+                    span_record['span_id'])
+            subtree, frontier = set(), list(root_span_ids)
+            while frontier:
+                span_id = frontier.pop()
+                subtree.add(span_id)
+                frontier.extend(children.get(span_id, []))
+            taken = [s for s in self.spans if s['span_id'] in subtree]
+            kept = [s for s in self.spans if s['span_id'] not in subtree]
+            self.spans.clear()
+            self.spans.extend(kept)
+        return sorted(taken, key=lambda s: s['start_ns'])
+
+
+def export_jsonl(spans: list[SpanRecord], file_name: str):
+    with open(file_name, 'w', encoding='utf-8') as file:
+        for span_record in spans:
+            file.write(simplejson.dumps(span_record, default=str) + '\n')
+
+
+def export_chrome_trace(spans: list[SpanRecord], file_name: str):
+    """
+    Complete ('X') events in microseconds, one track per thread
+    """
+    events = [{
+        'name': s['name'],
+        'ph': 'X',
+        'ts': s['start_ns'] / 1000,
+        'dur': s['duration_ns'] / 1000,
+        'pid': s['pid'],
+        'tid': s['thread_id'],
+        'args': s['attributes'],
+    } for s in spans]
+    with open(file_name, 'w', encoding='utf-8') as file:
+        simplejson.dump(
+            {'traceEvents': events, 'displayTimeUnit': 'ms'},
+            fp=file, default=str)
+
+
+def load_spans(pattern: str) -> list[SpanRecord]:
+    """
+    Spans from every JSON lines profile matching the pattern, e.g.
+        'experiments/**/profile.jsonl'
+    """
+    spans = []
+    for file_name in sorted(glob(pattern, recursive=True)):
+        with open(file_name, encoding='utf-8') as file:
+            spans.extend(simplejson.loads(line) for line in file if line.strip())
+    return spans
+
+
+def summarize(spans: list[SpanRecord]) -> list[SpanSummary]:
+    """
+    Aggregates spans by name, slowest total first
+    """
+    durations: dict[str, list[int]] = {}
+    for span_record in spans:
+        durations.setdefault(span_record['name'], []).append(
+            span_record['duration_ns'])
+    summaries = [
+        SpanSummary(
+            name=name, count=len(values),
+            total_seconds=sum(values) / 1e9,
+            mean_seconds=sum(values) / len(values) / 1e9,
+            max_seconds=max(values) / 1e9)
+        for name, values in durations.items()
+    ]
+    return sorted(summaries, key=lambda s: -s['total_seconds'])
+
+
+def print_summary(summaries: list[SpanSummary]):
+    for summary in summaries:
+        print(f'{summary["name"]}: {summary["count"]}x, '
+              f'{summary["total_seconds"]:.3f}s total, '
+              f'{summary["mean_seconds"] * 1000:.1f}ms mean, '
+              f'{summary["max_seconds"] * 1000:.1f}ms max')
+
+
+default_profiler = Profiler()
+span = default_profiler.span
+traced = default_profiler.traced
+
+
+def main():
+    """
+    python profiler.py [pattern (default experiments/**/profile.jsonl)]
+    """
+    print_summary(summarize(load_spans(
+        argv[1] if len(argv) > 1 else 'experiments/**/profile.jsonl')))
+
+
+if __name__ == '__main__':
+    main()
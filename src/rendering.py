@@ -0,0 +1,145 @@
+"""
+Deferred rendering: experiments only record render jobs in their run
+    folder; rendering happens later, in a headless (Agg) process pool,
+    skipping outputs that already exist
+"""
+from glob import glob
+from os.path import exists
+from sys import argv
+from typing import Literal, TypedDict
+
+import simplejson
+from qiskit import QuantumCircuit, qpy
+
+from process_pool import spawn_pool
+from results_store import read_counts
+
+RENDER_JOBS_FILE_NAME = 'render-jobs.jsonl'
+HISTOGRAM_TOP_OUTCOMES = 32
+
+
+class RenderJob(TypedDict):
+    kind: Literal['circuit', 'histogram']
+    source: str  # circuit .qpy file, or results file name (results_store)
+    file_name: str  # output prefix: utils.draw / utils.plot add the suffix
+    title: str
+
+
+def output_file_name(job: RenderJob, text: bool = False) -> str:
+    suffix = 'circuit' if job['kind'] == 'circuit' else 'histogram'
+    return f'{job["file_name"]}.{suffix}.{"txt" if text else "png"}'
+
+
+def record_render_job(run_folder: str, job: RenderJob):
+    with open(f'{run_folder}/{RENDER_JOBS_FILE_NAME}', 'a', encoding='utf-8') as file:
+        file.write(simplejson.dumps(job) + '\n')
+
+
+def record_circuit_render(
+        run_folder: str, circuit: QuantumCircuit, file_name: str):
+    """
+    Saves the circuit as QPY (cheap) so the render job can load it later
+    """
+    with open(f'{file_name}.qpy', 'wb') as file:
+        qpy.dump(circuit, file)
+    record_render_job(run_folder, RenderJob(
+        kind='circuit', source=f'{file_name}.qpy', file_name=file_name,
+        title=circuit.name))
+
+
+def record_histogram_render(run_folder: str, results_file_name: str):
+    record_render_job(run_folder, RenderJob(
+        kind='histogram', source=results_file_name,
+        file_name=results_file_name, title=results_file_name))
+
+
+def load_render_jobs(run_folder: str) -> list[RenderJob]:
+    file_name = f'{run_folder}/{RENDER_JOBS_FILE_NAME}'
+    if not exists(file_name):
+        return []
+    with open(file_name, encoding='utf-8') as file:
+        return [simplejson.loads(line) for line in file if line.strip()]
+
+
+def render_text(job: RenderJob) -> str:
+    """
+    Cheap summary instead of a drawing: circuit size and operation counts,
+        or the most frequent outcomes
+    """
+    if job['kind'] == 'circuit':
+        with open(job['source'], 'rb') as file:
+            circuit = qpy.load(file)[0]
+        operations = ''.join(
+            f'{name}: {count}\n' for name, count in circuit.count_ops().items())
+        content = f'{job["title"]}\nqubits: {circuit.num_qubits}\n' \
+            f'clbits: {circuit.num_clbits}\ndepth: {circuit.depth()}\n{operations}'
+    else:
+        counts = read_counts(job['source'])
+        items = sorted(counts.items(), key=lambda item: -item[1])
+        content = f'{job["title"]}\nshots: {counts.shots}\n' + ''.join(
+            f'{cbits} {count}\n' for cbits, count in items[:HISTOGRAM_TOP_OUTCOMES])
+
+    output = output_file_name(job, text=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        file.write(content)
+    return output
+
+
+def render(job: RenderJob) -> str:
+    """
+    Renders one job to PNG; falls back to the text summary if matplotlib
+        is missing or the drawing fails
+    """
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import utils
+        if job['kind'] == 'circuit':
+            with open(job['source'], 'rb') as file:
+                utils.draw(qpy.load(file)[0], job['file_name'])
+        else:
+            utils.plot(
+                read_counts(job['source']).to_dict(), job['file_name'])
+        return output_file_name(job)
+    except Exception as exception:  # pylint: disable=broad-except
+        print(f'rendering {job["file_name"]} failed ({exception}), '
+              f'writing a text summary')
+        return render_text(job)
+
+
+def render_pending(
+        pattern: str = 'experiments/**', text: bool = False,
+        max_workers: int | None = None) -> list[str]:
+    """
+    Renders every recorded job under the pattern whose output is missing.
+        A text summary (e.g. the fallback of a failed PNG) counts as the
+        output of a PNG job too: delete it to retry the drawing
+    """
+    jobs = [
+        job
+        for jobs_file in sorted(glob(
+            f'{pattern}/{RENDER_JOBS_FILE_NAME}', recursive=True))
+        for job in load_render_jobs(jobs_file[:-len(RENDER_JOBS_FILE_NAME) - 1])
+        if not exists(output_file_name(job, text=True))
+        and (text or not exists(output_file_name(job)))
+    ]
+    if text:
+        return [render_text(job) for job in jobs]
+    if not jobs:
+        return []
+    with spawn_pool(max_workers) as executor:
+        return list(executor.map(render, jobs))
+
+
+def main():
+    """
+    python rendering.py [pattern (default experiments/**)] [--text]
+    """
+    arguments = [a for a in argv[1:] if a != '--text']
+    outputs = render_pending(
+        arguments[0] if arguments else 'experiments/**', text='--text' in argv)
+    print(f'{len(outputs)} render jobs done')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Replicate runs: R seeded replicates of a scenario batched into a single
+    job, and the sampling distributions of the test statistics over them
+"""
+from os import cpu_count
+from time import perf_counter
+from typing import TypedDict
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from batch_statistics import batch_stat_test_results
+from counts import Counts
+from exact_result import exact_probabilities
+from runner import ScenarioRunner
+from scenario import Scenario
+
+
+class ReplicateStatistics(TypedDict):
+    scenario_id: str
+    reference_scenario_id: str
+    replicates: int
+    shots: int
+    seed: int | None
+    chi2_statistic: list[float]
+    chi2_pvalue: list[float]
+    g_pvalue: list[float]
+    tvd: list[float]
+    hellinger_fidelity: list[float]
+    seconds: float
+    replicates_per_second: float
+
+
+class ReplicateThroughput(TypedDict):
+    threads: int
+    replicates: int
+    seconds: float
+    replicates_per_second: float
+    speedup: float
+
+
+def replicate_run_options(backend, threads: int) -> dict:
+    """
+    Replicates are many small experiments: Aer runs them side by side
+        (one thread each) rather than parallelizing inside each one
+    """
+    if not hasattr(backend.options, 'max_parallel_threads'):
+        return {}
+    return {
+        'max_parallel_threads': threads,
+        'max_parallel_experiments': threads,
+    }
+
+
+class ReplicateRunner:
+
+    def __init__(
+            self, circuit: QuantumCircuit, scenario: Scenario,
+            replicates: int = 100, seed: int | None = None,
+            threads: int | None = None):
+        """
+        Aer gives every experiment of a job its own seed derived from
+            seed_simulator, so a seeded run is reproducible
+        """
+        self.circuit = circuit
+        self.scenario = scenario
+        self.replicates = replicates
+        self.seed = seed
+        self.threads = threads or cpu_count() or 1
+        self.seconds = 0.0
+
+    def run(self) -> list[Counts]:
+        start_time = perf_counter()
+        shots = self.scenario.get('shots', 1024)
+
+        if self.scenario.get('exact', False):
+            probabilities = exact_probabilities(self.circuit)
+            num_bits = len(next(iter(probabilities)))
+            indices = np.array([int(o, 2) for o in probabilities], dtype=np.uint64)
+            draws = np.random.default_rng(self.seed).multinomial(
+                shots, list(probabilities.values()), size=self.replicates)
+            replicate_counts = [
+                Counts.from_sparse(indices, values, num_bits) for values in draws]
+        else:
+            circuit, backend = ScenarioRunner(self.circuit, self.scenario).prepare()
+            run_options = replicate_run_options(backend, self.threads)
+            if self.seed is not None:
+                run_options['seed_simulator'] = self.seed
+            result = backend.run(
+                [circuit] * self.replicates, shots=shots, **run_options).result()
+            replicate_counts = [
+                Counts.from_result(result, i) for i in range(self.replicates)]
+
+        self.seconds = perf_counter() - start_time
+        return replicate_counts
+
+
+def run_replicate_statistics(
+        circuit: QuantumCircuit, reference_scenario: Scenario,
+        scenario: Scenario, replicates: int = 100,
+        seed: int | None = None) -> ReplicateStatistics:
+    """
+    Runs R replicates of both scenarios and tests replicate i of one against
+        replicate i of the other (chi-square contingency, as
+        stat_test_results, plus G-test, TVD and Hellinger fidelity) all at once
+    """
+    reference_seed, scenario_seed = \
+        np.random.SeedSequence(seed).generate_state(2) if seed is not None \
+        else (None, None)
+    start_time = perf_counter()
+    reference_counts = ReplicateRunner(
+        circuit, reference_scenario, replicates,
+        None if reference_seed is None else int(reference_seed)).run()
+    scenario_counts = ReplicateRunner(
+        circuit, scenario, replicates,
+        None if scenario_seed is None else int(scenario_seed)).run()
+    results = batch_stat_test_results(
+        list(zip(reference_counts, scenario_counts)))
+    seconds = perf_counter() - start_time
+
+    return ReplicateStatistics(
+        scenario_id=scenario['id'],
+        reference_scenario_id=reference_scenario['id'],
+        replicates=replicates,
+        shots=scenario.get('shots', 1024),
+        seed=seed,
+        chi2_statistic=results['chi2_contingency']['statistic'].tolist(),
+        chi2_pvalue=results['chi2_contingency']['pvalue'].tolist(),
+        g_pvalue=results['g_test']['pvalue'].tolist(),
+        tvd=results['tvd'].tolist(),
+        hellinger_fidelity=results['hellinger_fidelity'].tolist(),
+        seconds=seconds,
+        replicates_per_second=replicates / seconds)
+
+
+def measure_throughput(
+        circuit: QuantumCircuit, scenario: Scenario, replicates: int = 100,
+        thread_counts: list[int] | None = None,
+        seed: int | None = None) -> list[ReplicateThroughput]:
+    """
+    Runs the replicates once per thread count (powers of two up to the
+        cores by default) and reports replicates per second
+    """
+    if thread_counts is None:
+        cores = cpu_count() or 1
+        thread_counts = [1 << i for i in range(cores.bit_length())
+                         if 1 << i < cores] + [cores]
+
+    throughputs = []
+    for threads in thread_counts:
+        runner = ReplicateRunner(circuit, scenario, replicates, seed, threads)
+        runner.run()
+        throughputs.append(ReplicateThroughput(
+            threads=threads,
+            replicates=replicates,
+            seconds=runner.seconds,
+            replicates_per_second=replicates / runner.seconds,
+            speedup=throughputs[0]['seconds'] / runner.seconds
+            if throughputs else 1.0))
+    return throughputs
+
+
+def print_throughput(throughputs: list[ReplicateThroughput]):
+    for throughput in throughputs:
+        print(f'{throughput["threads"]} threads: '
+              f'{throughput["replicates_per_second"]:.1f} replicates/s '
+              f'({throughput["speedup"]:.1f}x)')
@@ -0,0 +1,151 @@
+"""
+Resampling two-sample tests for categorical outcome distributions:
+    permutation and parametric bootstrap replicates drawn in vectorized
+    shards, optionally spread over a process pool
+"""
+from time import perf_counter
+from typing import Tuple, TypedDict
+
+import numpy as np
+from scipy.stats import beta
+
+from process_pool import spawn_pool
+
+SHARD_REPLICATES = 1000  # replicates drawn at once: shard memory ~ 1000 x outcomes
+
+
+class ResamplingTestResult(TypedDict):
+    method: str
+    statistic_name: str
+    statistic: float
+    pvalue: float
+    pvalue_ci: Tuple[float, float]
+    replicates: int
+    exceedances: int
+    seconds: float
+
+
+def chi2_statistics(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """
+    Pearson chi-square contingency statistic (no Yates correction) for
+        every row pair of two replicates x outcomes matrices
+    """
+    observed = np.stack([expected, actual], axis=1).astype(np.float64)
+    row_totals = observed.sum(axis=2, keepdims=True)
+    column_totals = observed.sum(axis=1, keepdims=True)
+    frequencies = row_totals * column_totals / row_totals.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(
+            frequencies > 0, (observed - frequencies) ** 2 / frequencies, 0)
+    return terms.sum(axis=(1, 2))
+
+
+def tvd_statistics(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """
+    Total variation distance between the empirical distributions of every
+        row pair
+    """
+    p = expected / expected.sum(axis=1, keepdims=True)
+    q = actual / actual.sum(axis=1, keepdims=True)
+    return .5 * np.abs(p - q).sum(axis=1)
+
+
+STATISTICS = {
+    'chi2': chi2_statistics,
+    'tvd': tvd_statistics,
+}
+
+
+def _draw_shard(
+        expected: np.ndarray, actual: np.ndarray, method: str,
+        replicates: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws replicates x outcomes count matrices under H0 (same distribution):
+        a permutation relabels the pooled shots (multivariate
+        hypergeometric), a parametric bootstrap resamples both sides from
+        the pooled frequencies (multinomial)
+    """
+    pooled = expected + actual
+    expected_shots = int(expected.sum())
+    actual_shots = int(actual.sum())
+    if method == 'permutation':
+        expected_draws = rng.multivariate_hypergeometric(
+            pooled, expected_shots, size=replicates)
+        return expected_draws, pooled - expected_draws
+    if method == 'bootstrap':
+        probabilities = pooled / pooled.sum()
+        return (rng.multinomial(expected_shots, probabilities, size=replicates),
+                rng.multinomial(actual_shots, probabilities, size=replicates))
+    raise ValueError(f'unknown resampling method: {method}')
+
+
+def _count_exceedances(
+        expected: np.ndarray, actual: np.ndarray, method: str,
+        statistic_name: str, observed_statistic: float, replicates: int,
+        seed_sequence: np.random.SeedSequence) -> int:
+    rng = np.random.default_rng(seed_sequence)
+    expected_draws, actual_draws = _draw_shard(
+        expected, actual, method, replicates, rng)
+    statistics = STATISTICS[statistic_name](expected_draws, actual_draws)
+    # relative tolerance: ties with the observed statistic count as exceeding
+    return int((statistics >= observed_statistic * (1 - 1e-9)).sum())
+
+
+def pvalue_interval(
+        exceedances: int, replicates: int,
+        confidence: float = .95) -> Tuple[float, float]:
+    """
+    Clopper-Pearson interval for the exceedance probability: the Monte
+        Carlo error of the resampled p-value
+    """
+    tail = (1 - confidence) / 2
+    low = beta.ppf(tail, exceedances, replicates - exceedances + 1) \
+        if exceedances > 0 else 0.0
+    high = beta.ppf(1 - tail, exceedances + 1, replicates - exceedances) \
+        if exceedances < replicates else 1.0
+    return float(low), float(high)
+
+
+def resampling_test(
+        expected: np.ndarray, actual: np.ndarray,
+        method: str = 'permutation', statistic: str = 'chi2',
+        replicates: int = 10000, seed: int | None = None,
+        max_workers: int = 1, confidence: float = .95) -> ResamplingTestResult:
+    """
+    Two-sample test of aligned count vectors (see counts.align) against H0:
+        both come from the same categorical distribution. Replicates are
+        split into fixed shards, each with its own SeedSequence child, so a
+        seeded result does not depend on max_workers; max_workers > 1 runs
+        the shards in a process pool
+    """
+    start_time = perf_counter()
+    expected = np.asarray(expected, dtype=np.int64)
+    actual = np.asarray(actual, dtype=np.int64)
+    observed_statistic = float(
+        STATISTICS[statistic](expected[None, :], actual[None, :])[0])
+
+    num_shards = -(-replicates // SHARD_REPLICATES)
+    shard_sizes = [SHARD_REPLICATES] * (num_shards - 1) \
+        + [replicates - SHARD_REPLICATES * (num_shards - 1)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(num_shards)
+    shard_arguments = [
+        (expected, actual, method, statistic, observed_statistic, size, seq)
+        for size, seq in zip(shard_sizes, seed_sequences)
+    ]
+
+    if max_workers > 1 and num_shards > 1:
+        with spawn_pool(max_workers) as executor:
+            exceedances = sum(executor.map(
+                _count_exceedances, *zip(*shard_arguments)))
+    else:
+        exceedances = sum(_count_exceedances(*a) for a in shard_arguments)
+
+    return ResamplingTestResult(
+        method=method,
+        statistic_name=statistic,
+        statistic=observed_statistic,
+        pvalue=(exceedances + 1) / (replicates + 1),
+        pvalue_ci=pvalue_interval(exceedances, replicates, confidence),
+        replicates=replicates,
+        exceedances=exceedances,
+        seconds=perf_counter() - start_time)
@@ -0,0 +1,194 @@
+"""
+Per-stage resource accounting: peak RSS and thread count (psutil, sampled
+    in background), tracemalloc peak of Python allocations and CPU time,
+    recorded for the profiler spans of the experiment stages
+"""
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from itertools import count
+from os import environ
+from threading import Event, Lock, Thread
+from time import perf_counter_ns
+from typing import TypedDict
+
+import psutil
+import simplejson
+
+from profiler import MAX_SPANS, default_profiler
+
+STAGES = {
+    'transpile', 'noise_model_build', 'simulation', 'stats',
+    'artifact_write', 'artifact_flush',
+}
+SAMPLE_INTERVAL = .01
+# opt-in: tracemalloc slows down every Python allocation (about 3x on a
+#   small run); the psutil RSS, CPU and thread figures are always on
+TRACE_PYTHON_MEMORY = environ.get('TRACE_PYTHON_MEMORY', '0') != '0'
+
+
+class StageUsage(TypedDict):
+    stage: str
+    span_id: int | None  # the profiler span measured, if any
+    attributes: dict
+    start_ns: int
+    wall_seconds: float
+    # process-wide: includes Aer's threads and any overlapping stage
+    cpu_seconds: float
+    rss_start_bytes: int
+    rss_peak_bytes: int
+    python_peak_bytes: int | None  # above the traced memory at stage start
+    threads_peak: int
+
+
+class ResourceMonitor:
+
+    def __init__(
+            self, stages: set[str] | None = None,
+            sample_interval: float = SAMPLE_INTERVAL,
+            trace_python: bool = TRACE_PYTHON_MEMORY):
+        self.stages = STAGES if stages is None else stages
+        self.sample_interval = sample_interval
+        self.trace_python = trace_python
+        self.process = psutil.Process()
+        self.records: deque[StageUsage] = deque(maxlen=MAX_SPANS)
+        self.active: dict[int, dict] = {}
+        self.lock = Lock()
+        self.stage_ids = count()
+        self.stop_sampling: Event | None = None
+        self.started_tracing = False
+
+    def _cpu_seconds(self) -> float:
+        cpu_times = self.process.cpu_times()
+        return cpu_times.user + cpu_times.system
+
+    def _fold_python_peak(self):
+        """
+        The tracemalloc peak is process-wide: it goes into every active
+            stage before a new stage resets it. Call with the lock held
+        """
+        if tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            for state in self.active.values():
+                if state['python_peak'] is not None:
+                    state['python_peak'] = max(state['python_peak'], peak)
+
+    def _sample(self):
+        rss = self.process.memory_info().rss
+        threads = self.process.num_threads()
+        with self.lock:
+            for state in self.active.values():
+                state['rss_peak'] = max(state['rss_peak'], rss)
+                state['threads_peak'] = max(state['threads_peak'], threads)
+            self._fold_python_peak()
+
+    def _sampling_loop(self, stop_sampling: Event):
+        while not stop_sampling.wait(self.sample_interval):
+            self._sample()
+
+    @contextmanager
+    def stage(self, name: str, span_id: int | None = None, **attributes):
+        """
+        Measures the block; overlapping stages (concurrent simulations)
+            share the process-wide RSS, threads and CPU time
+        """
+        stage_id = next(self.stage_ids)
+        start_ns = perf_counter_ns()
+        cpu_start = self._cpu_seconds()
+        rss_start = self.process.memory_info().rss
+        threads_start = self.process.num_threads()
+        with self.lock:
+            if self.trace_python and not tracemalloc.is_tracing():
+                # traced only while some stage runs
+                tracemalloc.start()
+                self.started_tracing = True
+            python_start = None
+            if tracemalloc.is_tracing():
+                self._fold_python_peak()
+                tracemalloc.reset_peak()
+                python_start = tracemalloc.get_traced_memory()[0]
+            self.active[stage_id] = {
+                'rss_peak': rss_start,
+                'threads_peak': threads_start,
+                'python_peak': python_start,
+            }
+            if self.stop_sampling is None:
+                self.stop_sampling = Event()
+                Thread(
+                    target=self._sampling_loop, args=(self.stop_sampling,),
+                    name='resource-sampler', daemon=True).start()
+        try:
+            yield attributes
+        finally:
+            self._sample()
+            with self.lock:
+                state = self.active.pop(stage_id)
+                if not self.active:
+                    self.stop_sampling.set()
+                    self.stop_sampling = None
+                    if self.started_tracing:
+                        tracemalloc.stop()
+                        self.started_tracing = False
+                self.records.append(StageUsage(
+                    stage=name,
+                    span_id=span_id,
+                    attributes=dict(attributes),
+                    start_ns=start_ns,
+                    wall_seconds=(perf_counter_ns() - start_ns) / 1e9,
+                    cpu_seconds=self._cpu_seconds() - cpu_start,
+                    rss_start_bytes=rss_start,
+                    rss_peak_bytes=state['rss_peak'],
+                    python_peak_bytes=None if python_start is None
+                    else state['python_peak'] - python_start,
+                    threads_peak=state['threads_peak']))
+
+    def hook(self, span_id: int, name: str, attributes: dict):
+        """
+        Profiler hook: measures the spans named after a stage
+        """
+        if name not in self.stages:
+            return nullcontext()
+        return self.stage(name, span_id, **attributes)
+
+    def take_records(self, span_ids: set[int]) -> list[StageUsage]:
+        """
+        Removes and returns the records of the given profiler spans
+        """
+        with self.lock:
+            taken = [r for r in self.records if r['span_id'] in span_ids]
+            kept = [r for r in self.records if r['span_id'] not in span_ids]
+            self.records.clear()
+            self.records.extend(kept)
+        return sorted(taken, key=lambda r: r['start_ns'])
+
+
+def export_json(records: list[StageUsage], file_name: str):
+    with open(file_name, 'w', encoding='utf-8') as file:
+        simplejson.dump(
+            records, fp=file, indent=4, sort_keys=True, default=str)
+
+
+def print_peak_usage(records: list[StageUsage]):
+    """
+    One line per stage: the worst of its records. CPU time is process-wide,
+        so overlapping records (concurrent simulations) are not summed
+    """
+    stages = {}
+    for record in records:
+        stages.setdefault(record['stage'], []).append(record)
+    for stage, stage_records in stages.items():
+        python_peaks = [
+            r['python_peak_bytes'] for r in stage_records
+            if r['python_peak_bytes'] is not None]
+        python_peak = f'{max(python_peaks) / 2**20:.0f}MB' \
+            if python_peaks else 'untraced'
+        rss_peak = max(r['rss_peak_bytes'] for r in stage_records)
+        print(f'{stage}: peak RSS {rss_peak / 2**20:.0f}MB, '
+              f'python peak {python_peak}, '
+              f'{max(r["cpu_seconds"] for r in stage_records):.2f}s CPU max, '
+              f'{max(r["threads_peak"] for r in stage_records)} threads')
+
+
+default_monitor = ResourceMonitor()
+# the experiment stages are already profiler spans: measure those
+default_profiler.hooks.append(default_monitor.hook)
@@ -0,0 +1,119 @@
+"""
+Columnar results store: counts as .npy arrays (dense values, or sparse
+    outcomes + values) plus a small JSON metadata file per result; readers
+    memory-map the arrays. compress=True writes one compressed .npz instead
+    (smaller, but read into memory)
+"""
+from glob import glob
+from typing import NotRequired, TypedDict
+
+import numpy as np
+import simplejson
+
+from counts import Counts
+
+
+class ResultsMetadata(TypedDict):
+    num_bits: int
+    shots: int
+    dense: bool
+    compressed: bool
+    backend_name: NotRequired[str | None]
+    job_id: NotRequired[str | None]
+    seed_simulator: NotRequired[int | None]
+    time_taken: NotRequired[float | None]
+    experiment_id: NotRequired[str]
+    scenario_id: NotRequired[str]
+    backend_fingerprint: NotRequired[str]
+    circuit_hash: NotRequired[str]
+    stat_test: NotRequired[dict]  # name, statistic, pvalue vs the reference
+
+
+def result_metadata(result) -> dict:
+    """
+    The few Result fields worth keeping, instead of the whole object dump
+    """
+    metadata = {
+        'backend_name': getattr(result, 'backend_name', None),
+        'job_id': getattr(result, 'job_id', None),
+        'time_taken': getattr(result, 'time_taken', None),
+    }
+    experiments = getattr(result, 'results', None)
+    if experiments:
+        metadata['seed_simulator'] = getattr(experiments[0], 'seed_simulator', None)
+    elif hasattr(result, 'seed'):  # ExactResult
+        metadata['seed_simulator'] = result.seed
+    return metadata
+
+
+def write_counts(
+        counts: Counts, file_name: str, metadata: dict | None = None,
+        compress: bool = False) -> ResultsMetadata:
+    """
+    Writes {file_name}.counts.npy (+ .outcomes.npy when sparse), or
+        {file_name}.counts.npz with compress, and {file_name}.results.json
+    """
+    results_metadata = ResultsMetadata(
+        num_bits=counts.num_bits,
+        shots=counts.shots,
+        dense=counts.is_dense,
+        compressed=compress,
+        **(metadata or {}))
+
+    arrays = {'values': counts.values}
+    if not counts.is_dense:
+        arrays['outcomes'] = counts.indices
+    if compress:
+        np.savez_compressed(f'{file_name}.counts.npz', **arrays)
+    else:
+        np.save(f'{file_name}.counts.npy', counts.values)
+        if not counts.is_dense:
+            np.save(f'{file_name}.outcomes.npy', counts.indices)
+
+    with open(f'{file_name}.results.json', 'w', encoding='utf-8') as file:
+        simplejson.dump(
+            results_metadata, fp=file, indent=4, sort_keys=True, ignore_nan=True)
+    return results_metadata
+
+
+def read_metadata(file_name: str) -> ResultsMetadata:
+    with open(f'{file_name}.results.json', encoding='utf-8') as file:
+        return simplejson.load(file)
+
+
+def update_metadata(file_name: str, **fields) -> ResultsMetadata:
+    metadata = read_metadata(file_name)
+    metadata.update(fields)
+    with open(f'{file_name}.results.json', 'w', encoding='utf-8') as file:
+        # ignore_nan: an infinite statistic (counts outside the exact
+        #   support) is stored as null
+        simplejson.dump(
+            metadata, fp=file, indent=4, sort_keys=True, ignore_nan=True)
+    return metadata
+
+
+def read_counts(file_name: str) -> Counts:
+    """
+    Memory-maps uncompressed arrays: the counts are paged in on first use
+    """
+    metadata = read_metadata(file_name)
+    if metadata['compressed']:
+        with np.load(f'{file_name}.counts.npz') as arrays:
+            values = arrays['values']
+            indices = None if metadata['dense'] else arrays['outcomes']
+    else:
+        values = np.load(f'{file_name}.counts.npy', mmap_mode='r')
+        indices = None if metadata['dense'] \
+            else np.load(f'{file_name}.outcomes.npy', mmap_mode='r')
+    return Counts(metadata['num_bits'], values, indices)
+
+
+def load_campaign(pattern: str = 'experiments/**') -> dict[str, Counts]:
+    """
+    Every stored result under the pattern, by file name (without suffixes)
+    """
+    suffix = '.results.json'
+    return {
+        path[:-len(suffix)]: read_counts(path[:-len(suffix)])
+        for path in sorted(glob(f'{pattern}/*{suffix}', recursive=True))
+    }
@@ -1,21 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from os import cpu_count
+from typing import Iterator, Tuple
+
 from qiskit import QuantumCircuit
+from qiskit.providers import Job
 from qiskit.result.result import Result
+from qiskit_ibm_runtime.ibm_backend import Backend
 
+from compaction import compact_circuit, compacted_simulator, used_gates
+from exact_result import ExactResult
+from profiler import span
 from scenario import Scenario
 from utils import print_exec_time
 
 class ScenarioRunner:
 
-    def __init__(self, circuit: QuantumCircuit, scenario: Scenario):
+    def __init__(
+            self, circuit: QuantumCircuit, scenario: Scenario,
+            run_options: dict | None = None):
         self.circuit = circuit
         self.scenario = scenario
-    
-    @print_exec_time
-    def run(self) -> Result:
+        self.run_options = run_options or {}
+
+    def prepare(self) -> Tuple[QuantumCircuit, Backend]:
+        """
+        Returns the circuit and backend the scenario actually runs on
+            (compacted ones if scenario['compact'])
+        """
         backend = self.scenario['backend']
+        circuit = self.circuit
+
+        if self.scenario.get('compact', False):
+            compacted = compact_circuit(circuit)
+            circuit = compacted['circuit']
+            backend = compacted_simulator(
+                backend, compacted['active_qubits'],
+                ideal=self.scenario.get('ideal', False),
+                gates=used_gates(circuit))
+        return circuit, backend
+
+    def submit(self) -> Job:
         shots = self.scenario.get('shots', 1024)
-        
-        job_result: Result = backend \
-            .run(self.circuit, shots=shots) \
-            .result()
-        return job_result
+        circuit, backend = self.prepare()
+        return backend.run(circuit, shots=shots, **self.run_options)
+
+    @print_exec_time
+    def run(self) -> Result | ExactResult:
+        shots = self.scenario.get('shots', 1024)
+        with span('simulation', scenario_id=self.scenario.get('id'),
+                  shots=shots, qubits=self.circuit.num_qubits):
+            if self.scenario.get('exact', False):
+                return ExactResult.from_circuit(self.circuit, shots)
+
+            job_result: Result = self.submit().result()
+            return job_result
+
+
+def aer_thread_budget(backend, num_concurrent: int) -> dict:
+    """
+    Splits the cores between concurrent Aer simulations so they don't
+        oversubscribe them; empty for backends without Aer options
+    """
+    if not hasattr(backend.options, 'max_parallel_threads'):
+        return {}
+    threads = max(1, (cpu_count() or 1) // num_concurrent)
+    return {
+        'max_parallel_threads': threads,
+        'max_parallel_experiments': 1,
+    }
+
+
+class ConcurrentScenarioRunner:
+
+    def __init__(
+            self, circuit: QuantumCircuit, scenarios: list[Scenario],
+            max_workers: int | None = None):
+        self.circuit = circuit
+        self.scenarios = scenarios
+        self.max_workers = max_workers or len(scenarios)
+
+    def run(self) -> Iterator[Tuple[Scenario, Result]]:
+        """
+        Submits every scenario up front and yields (scenario, result)
+            pairs as they finish
+        """
+        num_concurrent = max(1, min(self.max_workers, len(self.scenarios)))
+        with ThreadPoolExecutor(max_workers=num_concurrent) as executor:
+            futures = {}
+            for scenario in self.scenarios:
+                run_options = aer_thread_budget(
+                    scenario['backend'], num_concurrent)
+                runner = ScenarioRunner(
+                    circuit=self.circuit, scenario=scenario,
+                    run_options=run_options)
+                # copy_context: the worker's spans nest under the caller's
+                futures[executor.submit(copy_context().run, runner.run)] = \
+                    scenario
+
+            for future in as_completed(futures):
+                yield futures[future], future.result()
@@ -1,4 +1,4 @@
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 from qiskit_ibm_runtime.ibm_backend import Backend
 
@@ -7,3 +7,6 @@ class Scenario(TypedDict):
     id: str
     backend: Backend
     shots: int
+    compact: NotRequired[bool]  # simulate on the active qubits only
+    ideal: NotRequired[bool]  # with compact: drop the backend noise
+    exact: NotRequired[bool]  # Statevector probabilities, no simulator run
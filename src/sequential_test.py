@@ -0,0 +1,94 @@
+"""
+Sequential testing: runs a scenario in shot chunks and stops as soon as
+    the ideal-versus-noisy decision is reached
+"""
+from typing import Tuple, TypedDict
+
+from qiskit import QuantumCircuit
+from qiskit.result.result import Result
+
+from counts import Counts
+from runner import ScenarioRunner
+from scenario import Scenario
+from statistical_test import stat_test_results
+
+
+class SequentialTestResult(TypedDict):
+    rejected: bool  # H0: same distribution as the reference
+    stopped_early: bool
+    shots_used: int
+    shots_budget: int
+    looks: int
+    statistic: float
+    pvalue: float
+    alpha_spent: float
+
+
+def alpha_spending(fraction: float, alpha: float, rho: float = 3.0) -> float:
+    """
+    Power-family alpha spending function alpha * t^rho; rho = 3 spends
+        little alpha on early looks (close to O'Brien-Fleming)
+    """
+    return alpha * min(fraction, 1.0) ** rho
+
+
+class SequentialScenarioRunner:
+
+    def __init__(
+            self, circuit: QuantumCircuit, scenario: Scenario,
+            reference_result: Result, chunk_shots: int = 1000,
+            alpha: float = .05, rho: float = 3.0):
+        """
+        reference_result is the ideal result (an ExactResult gives a
+            goodness-of-fit test, otherwise a chi-square contingency);
+            scenario['shots'] is the shot budget
+        """
+        self.circuit = circuit
+        self.scenario = scenario
+        self.reference_result = reference_result
+        self.chunk_shots = chunk_shots
+        self.alpha = alpha
+        self.rho = rho
+
+    def run(self) -> Tuple[Counts, SequentialTestResult]:
+        """
+        Each look spends alpha(t_k) - alpha(t_k-1) of the error budget
+            (union bound over looks), so the overall type I error rate
+            stays below alpha however early the run stops
+        """
+        shots_budget = self.scenario.get('shots', 1024)
+        counts = None
+        shots_used = 0
+        looks = 0
+        spent = 0.0
+        pvalue = 1.0
+        statistic = 0.0
+        rejected = False
+
+        while shots_used < shots_budget and not rejected:
+            chunk_shots = min(self.chunk_shots, shots_budget - shots_used)
+            chunk_scenario = Scenario(**{**self.scenario, 'shots': chunk_shots})
+            chunk_result = ScenarioRunner(self.circuit, chunk_scenario).run()
+            chunk_counts = Counts.from_result(chunk_result)
+            counts = chunk_counts if counts is None else counts + chunk_counts
+            shots_used += chunk_shots
+            looks += 1
+
+            test_result = next(iter(
+                stat_test_results(self.reference_result, counts).values()))
+            statistic = float(test_result['statistic'])
+            pvalue = float(test_result['pvalue'])
+            alpha_spent = alpha_spending(
+                shots_used / shots_budget, self.alpha, self.rho)
+            rejected = pvalue < alpha_spent - spent
+            spent = alpha_spent
+
+        return counts, SequentialTestResult(
+            rejected=rejected,
+            stopped_early=shots_used < shots_budget,
+            shots_used=shots_used,
+            shots_budget=shots_budget,
+            looks=looks,
+            statistic=statistic,
+            pvalue=pvalue,
+            alpha_spent=spent)
@@ -0,0 +1,135 @@
+"""
+Per-shot measurement data: SamplerV2 BitArray packed bytes persisted as
+    .npy and memory-mapped back, with counts, marginals and drift computed
+    chunk by chunk over integer-decoded shots
+"""
+from typing import Iterator, TypedDict
+
+import numpy as np
+import simplejson
+from qiskit.primitives.containers import BitArray
+from scipy.stats import chi2_contingency
+
+from counts import Counts, bit_array_outcomes
+
+CHUNK_SHOTS = 1 << 16  # shots decoded at once: 512KB of uint64 outcomes
+MIN_EXPECTED_COUNT = 5
+
+
+class ShotsMetadata(TypedDict):
+    num_bits: int
+    num_shots: int
+
+
+class DriftResult(TypedDict):
+    window_shots: int
+    windows: int
+    tvd: list[float]  # each window against the whole run
+    statistic: float  # chi-square homogeneity of the windows
+    pvalue: float
+
+
+def write_shots(bit_array: BitArray, file_name: str) -> str:
+    """
+    Writes the packed bytes (shots x bytes, big-endian as in BitArray) to
+        {file_name}.shots.npy, num_bits to {file_name}.shots.json
+    """
+    packed = bit_array.array.reshape(-1, bit_array.array.shape[-1])
+    np.save(f'{file_name}.shots.npy', packed)
+    with open(f'{file_name}.shots.json', 'w', encoding='utf-8') as file:
+        simplejson.dump(
+            ShotsMetadata(num_bits=bit_array.num_bits, num_shots=len(packed)),
+            fp=file, indent=4, sort_keys=True)
+    return f'{file_name}.shots.npy'
+
+
+def load_shots(file_name: str) -> BitArray:
+    """
+    Memory-maps the packed shots back: nothing is read until it is used
+    """
+    with open(f'{file_name}.shots.json', encoding='utf-8') as file:
+        metadata: ShotsMetadata = simplejson.load(file)
+    packed = np.load(f'{file_name}.shots.npy', mmap_mode='r')
+    return BitArray(packed, metadata['num_bits'])
+
+
+def iter_outcomes(
+        bit_array: BitArray, chunk_shots: int = CHUNK_SHOTS) -> Iterator[np.ndarray]:
+    """
+    Yields the integer outcome of each shot, in shot order, chunk by chunk
+    """
+    packed = bit_array.array.reshape(-1, bit_array.array.shape[-1])
+    for start in range(0, len(packed), chunk_shots):
+        yield bit_array_outcomes(
+            BitArray(packed[start:start + chunk_shots], bit_array.num_bits))
+
+
+def shot_counts(bit_array: BitArray, chunk_shots: int = CHUNK_SHOTS) -> Counts:
+    counts = Counts.from_outcomes(np.zeros(0, dtype=np.uint64), bit_array.num_bits)
+    for outcomes in iter_outcomes(bit_array, chunk_shots):
+        counts = counts + Counts.from_outcomes(outcomes, bit_array.num_bits)
+    return counts
+
+
+def marginal_outcomes(outcomes: np.ndarray, bits: list[int]) -> np.ndarray:
+    """
+    Keeps the given bits (clbit indices, bit 0 is the right-most) of every
+        outcome: bit i of the marginal outcome is bit bits[i]
+    """
+    marginal = np.zeros(len(outcomes), dtype=np.uint64)
+    for i, bit in enumerate(bits):
+        marginal |= ((outcomes >> np.uint64(bit)) & np.uint64(1)) << np.uint64(i)
+    return marginal
+
+
+def marginal_counts(
+        bit_array: BitArray, bits: list[int],
+        chunk_shots: int = CHUNK_SHOTS) -> Counts:
+    counts = Counts.from_outcomes(np.zeros(0, dtype=np.uint64), len(bits))
+    for outcomes in iter_outcomes(bit_array, chunk_shots):
+        counts = counts + Counts.from_outcomes(
+            marginal_outcomes(outcomes, bits), len(bits))
+    return counts
+
+
+def drift(bit_array: BitArray, window_shots: int = 1000) -> DriftResult:
+    """
+    Splits the shots (in execution order) into windows and tests whether
+        the outcome distribution stays the same across them (chi-square
+        contingency over windows x outcomes, rare outcomes pooled); a
+        trailing partial window is left out
+    """
+    if bit_array.num_shots < window_shots:
+        raise ValueError(
+            f'{bit_array.num_shots} shots do not fill a window of '
+            f'{window_shots}')
+    windows = []
+    for outcomes in iter_outcomes(
+            bit_array, chunk_shots=window_shots * max(1, CHUNK_SHOTS // window_shots)):
+        for start in range(0, len(outcomes) - window_shots + 1, window_shots):
+            windows.append(np.unique(
+                outcomes[start:start + window_shots], return_counts=True))
+
+    observed = np.unique(np.concatenate([indices for indices, _ in windows]))
+    table = np.zeros((len(windows), len(observed)))
+    for row, (indices, values) in enumerate(windows):
+        table[row, np.searchsorted(observed, indices)] = values
+
+    overall = table.sum(axis=0) / table.sum()
+    tvd = .5 * np.abs(table / window_shots - overall).sum(axis=1)
+
+    # rare outcomes pooled into one column: sparse cells would swamp the
+    #   test with degrees of freedom (and break its asymptotics)
+    rare = overall * window_shots < MIN_EXPECTED_COUNT
+    if rare.any():
+        table = np.column_stack([
+            table[:, ~rare], table[:, rare].sum(axis=1)])
+    test_result = chi2_contingency(table) \
+        if table.shape[1] > 1 and len(table) > 1 else None
+
+    return DriftResult(
+        window_shots=window_shots,
+        windows=len(windows),
+        tvd=tvd.tolist(),
+        statistic=float(test_result.statistic) if test_result else 0.0,
+        pvalue=float(test_result.pvalue) if test_result else 1.0)
@@ -0,0 +1,111 @@
+"""
+A-priori shot budgets: the minimum shots for the chi-square test to detect
+    a given total variation distance with the desired power
+"""
+import numpy as np
+from scipy.stats import chi2, ncx2
+
+from scenario import Scenario
+
+MAX_SHOTS = 10 ** 8
+
+
+def least_favorable_alternative(
+        probabilities: np.ndarray, min_tvd: float) -> np.ndarray:
+    """
+    Returns the distribution at TVD min_tvd from probabilities that is the
+        hardest for the chi-square test to detect: mass moved proportionally
+        from one half of the outcomes (by probability) to the other half,
+        which minimizes Cohen's w^2 = min_tvd^2 * (1/P+ + 1/P-)
+    """
+    p = np.asarray(probabilities, dtype=np.float64)
+    p = p / p.sum()
+
+    gaining = np.zeros(len(p), dtype=bool)
+    gaining_mass = losing_mass = 0.0
+    for i in np.argsort(p)[::-1]:  # greedy balanced partition
+        if gaining_mass <= losing_mass:
+            gaining[i] = True
+            gaining_mass += p[i]
+        else:
+            losing_mass += p[i]
+    if min_tvd > min(gaining_mass, losing_mass):
+        raise ValueError(
+            f'min_tvd={min_tvd} is too large for this distribution')
+
+    q = p.copy()
+    q[gaining] += min_tvd * p[gaining] / gaining_mass
+    q[~gaining] -= min_tvd * p[~gaining] / losing_mass
+    return q
+
+
+def effect_size(probabilities: np.ndarray, alternative: np.ndarray) -> float:
+    """
+    Cohen's w for the chi-square test
+    """
+    p = np.asarray(probabilities, dtype=np.float64)
+    support = p > 0
+    return float(np.sqrt(
+        ((alternative[support] - p[support]) ** 2 / p[support]).sum()))
+
+
+def chi2_power(
+        shots: int, w: float, dof: int, alpha: float = .05,
+        two_sample: bool = True) -> float:
+    """
+    Power of the chi-square test with shots per scenario: two_sample is
+        the contingency test of stat_test_results (noncentrality n w^2 / 2
+        for equal samples), otherwise goodness of fit (n w^2)
+    """
+    noncentrality = shots * w ** 2 / (2 if two_sample else 1)
+    critical_value = chi2.ppf(1 - alpha, dof)
+    return float(ncx2.sf(critical_value, dof, noncentrality))
+
+
+def plan_shots(
+        probabilities, min_tvd: float, alpha: float = .05,
+        power: float = .8, two_sample: bool = True) -> int:
+    """
+    Returns the minimum shots per scenario for the chi-square test to
+        detect any distribution at TVD >= min_tvd (worst case) from the
+        expected one with the desired power at significance alpha
+    """
+    if isinstance(probabilities, dict):
+        probabilities = list(probabilities.values())
+    p = np.asarray(probabilities, dtype=np.float64)
+    p = p[p > 0]
+    dof = len(p) - 1
+    w = effect_size(p, least_favorable_alternative(p, min_tvd))
+
+    def has_power(shots: int) -> bool:
+        return chi2_power(shots, w, dof, alpha, two_sample) >= power
+
+    high = 1
+    while not has_power(high):
+        high *= 2
+        if high > MAX_SHOTS:
+            raise ValueError(f'more than {MAX_SHOTS} shots required')
+    low = high // 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if has_power(middle):
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def fill_scenario_shots(
+        scenarios: list[Scenario], probabilities, min_tvd: float,
+        alpha: float = .05, power: float = .8,
+        overwrite: bool = False) -> list[Scenario]:
+    """
+    Sets the planned shots on scenarios without shots (or on all of them
+        with overwrite); an exact scenario means a goodness-of-fit test
+    """
+    two_sample = not any(s.get('exact', False) for s in scenarios)
+    shots = plan_shots(probabilities, min_tvd, alpha, power, two_sample)
+    for scenario in scenarios:
+        if overwrite or 'shots' not in scenario:
+            scenario['shots'] = shots
+    return scenarios
@@ -1,34 +1,18 @@
 from typing import Tuple
 
-from numpy import array as np_array
 from qiskit.result.result import Result
 from scipy.stats import shapiro, ks_2samp, mannwhitneyu
 
+from counts import Counts, align_results
+from resampling import resampling_test
+
 def _results_to_data_arrays(
     expected_result: Result, actual_result: Result) -> Tuple:
-    expected_counts: dict = expected_result.get_counts()
-    actual_counts: dict = actual_result.get_counts()
-    observed_outputs = set(
-        list(expected_counts.keys()) +
-        list(actual_counts.keys())
-    )
-
-    expected_data: list[int] = []
-    actual_data: list[int] = []
-    for o in observed_outputs:
-        expected_data.append(expected_counts.get(o, 0))
-        actual_data.append(actual_counts.get(o, 0))
-    expected_data = np_array(expected_data)
-    actual_data = np_array(actual_data)
-
-    return expected_data, actual_data
+    return align_results(expected_result, actual_result)
 
 def _result_to_data_array(result: Result):
-    return np_array([
-        v
-        for _, v in sorted(
-            result.get_counts().items())
-        ])
+    _, values = Counts.from_result(result).nonzero()
+    return values
 
 def assertSameDistributionKomogorov(
     expected_result: Result, actual_result: Result,
@@ -67,3 +51,26 @@ def assertIsNormalShapiro(result: Result, pvalue: float = .05):
         message = f'Calculated p-value = {shapiro_result.pvalue} < {pvalue}\n' \
             + 'Samples do not derive from a normal distribution'
         raise AssertionError(message)
+
+
+def assertSameDistributionPermutation(
+    expected_result: Result, actual_result: Result,
+    pvalue: float = .05, replicates: int = 2000, seed: int | None = None,
+    method: str = 'permutation', statistic: str = 'chi2'):
+    """
+    Resampling chi-square (or TVD) test over the categorical outcomes;
+        method='bootstrap' resamples from the pooled frequencies instead
+    """
+    expected_data, actual_data = _results_to_data_arrays(
+            expected_result, actual_result)
+
+    test_result = resampling_test(
+        expected_data, actual_data, method=method, statistic=statistic,
+        replicates=replicates, seed=seed)
+
+    if test_result['pvalue'] < pvalue:
+        low, high = test_result['pvalue_ci']
+        message = f'Calculated p-value = {test_result["pvalue"]} < {pvalue}' \
+            + f' (95% CI [{low:.4f}, {high:.4f}], {replicates} {method} replicates)\n' \
+            + 'Samples derive from different distributions'
+        raise AssertionError(message)
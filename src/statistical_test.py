@@ -1,8 +1,10 @@
-from typing import TypedDict, Tuple
+from typing import NotRequired, TypedDict, Tuple
 
-from numpy import float64, array as np_array
+from numpy import float64, inf, array as np_array
 from qiskit.result.result import Result
-from scipy.stats import chi2_contingency
+from scipy.stats import chi2_contingency, chisquare
+
+from counts import align_results
 
 
 class StatisticalTestResult(TypedDict):
@@ -11,37 +13,53 @@ class StatisticalTestResult(TypedDict):
 
 
 class StatisticalTestsResultsByType(TypedDict):
-    chi2_contingency: StatisticalTestResult
+    chi2_contingency: NotRequired[StatisticalTestResult]
+    chi2_goodness_of_fit: NotRequired[StatisticalTestResult]
 
 
 def results_to_data_arrays(
     expected_result: Result, actual_result: Result) -> Tuple:
-    expected_counts: dict = expected_result.get_counts()
-    actual_counts: dict = actual_result.get_counts()
-    observed_outputs = set(
-        list(expected_counts.keys()) +
-        list(actual_counts.keys())
-    )
+    return align_results(expected_result, actual_result)
+
+
+def goodness_of_fit(
+    probabilities: dict[str, float], actual_counts: dict) \
+        -> StatisticalTestResult:
+    """
+    Chi-square goodness of fit of the counts against exact probabilities;
+        counts on a zero-probability outcome reject H0 outright
+    """
+    if any(o not in probabilities for o in actual_counts):
+        return StatisticalTestResult(statistic=float64(inf), pvalue=float64(0))
 
-    expected_data: list[int] = []
-    actual_data: list[int] = []
-    for o in observed_outputs:
-        expected_data.append(expected_counts.get(o, 0))
-        actual_data.append(actual_counts.get(o, 0))
-    expected_data = np_array(expected_data)
-    actual_data = np_array(actual_data)
+    outputs = sorted(probabilities)
+    shots = sum(actual_counts.values())
+    expected_data = np_array([probabilities[o] for o in outputs])
+    expected_data = shots * expected_data / expected_data.sum()
+    actual_data = np_array([actual_counts.get(o, 0) for o in outputs])
 
-    return expected_data, actual_data
+    result = chisquare(actual_data, expected_data)
+    return StatisticalTestResult(
+        statistic=result.statistic, pvalue=result.pvalue)
 
 
 def stat_test_results(expected_result: Result, actual_result: Result) \
             -> StatisticalTestsResultsByType:
+    if hasattr(expected_result, 'get_probabilities'):  # ExactResult
+        return {
+            "chi2_goodness_of_fit": goodness_of_fit(
+                expected_result.get_probabilities(),
+                actual_result.get_counts()),
+        }
+
     expected_data, actual_data = results_to_data_arrays(
             expected_result, actual_result)
-    
+
     chi2_test_result = chi2_contingency([expected_data, actual_data])
     stat_test_results = {
-        "chi2_contingency": chi2_test_result,
+        "chi2_contingency": StatisticalTestResult(
+            statistic=chi2_test_result.statistic,
+            pvalue=chi2_test_result.pvalue),
     }
 
-    return stat_test_results
\ No newline at end of file
+    return stat_test_results
@@ -0,0 +1,101 @@
+"""
+Hardware submission layer: collects circuits from several experiments into
+    multi-PUB SamplerV2 jobs, run in a Batch (or Session) where the plan
+    allows, and records which PUBs belong to which run folder
+"""
+from typing import TypedDict
+
+from qiskit import QuantumCircuit
+from qiskit_ibm_runtime import Batch, SamplerV2 as Sampler, Session
+from qiskit_ibm_runtime.ibm_backend import Backend
+
+from job_manager import JobRecord, PubRecord, record_job_id
+
+MAX_PUBS_PER_JOB = 100
+EXECUTION_MODES = {
+    'batch': Batch,
+    'session': Session,
+}
+
+
+class PubRequest(TypedDict):
+    experiment_id: str
+    run_folder: str
+    label: str
+    circuit: QuantumCircuit
+    shots: int
+
+
+class HardwareSubmission:
+
+    def __init__(
+            self, backend: Backend, mode: str = 'batch',
+            max_pubs_per_job: int = MAX_PUBS_PER_JOB):
+        """
+        mode is 'batch', 'session' or 'job' (no execution mode); plans that
+            cannot open a batch or session fall back to 'job'
+        """
+        self.backend = backend
+        self.mode = mode
+        self.max_pubs_per_job = max_pubs_per_job
+        self.requests: list[PubRequest] = []
+
+    def add(
+            self, experiment_id: str, run_folder: str, circuit: QuantumCircuit,
+            shots: int = 10000, label: str | None = None):
+        self.requests.append(PubRequest(
+            experiment_id=experiment_id,
+            run_folder=run_folder,
+            label=label or experiment_id,
+            circuit=circuit,
+            shots=shots))
+
+    def _open_mode(self):
+        if self.mode == 'job':
+            return None
+        try:
+            return EXECUTION_MODES[self.mode](backend=self.backend)
+        except KeyError:
+            raise ValueError(f'unknown execution mode: {self.mode}') from None
+        except Exception as exception:  # pylint: disable=broad-except
+            print(f'{self.mode} mode unavailable ({exception}), '
+                  f'submitting plain jobs')
+            return None
+
+    def submit(self) -> list[tuple[object, list[JobRecord]]]:
+        """
+        Sends the requests max_pubs_per_job PUBs per job and records every
+            job in the jobs.json of each run folder it has PUBs for. If a
+            job fails to submit, the requests not yet sent stay queued
+        """
+        execution_mode = self._open_mode()
+        sampler = Sampler(mode=execution_mode or self.backend)
+        backend_name = getattr(self.backend, 'name', None)
+
+        submitted = []
+        try:
+            while self.requests:
+                requests = self.requests[:self.max_pubs_per_job]
+                job = sampler.run(
+                    [(request['circuit'], None, request['shots'])
+                     for request in requests])
+
+                pubs_by_folder: dict[tuple[str, str], list[PubRecord]] = {}
+                for index, request in enumerate(requests):
+                    pubs_by_folder.setdefault(
+                        (request['run_folder'], request['experiment_id']), []
+                    ).append(PubRecord(index=index, label=request['label']))
+                records = [
+                    record_job_id(
+                        run_folder, job.job_id(), experiment_id, backend_name,
+                        pubs)
+                    for (run_folder, experiment_id), pubs
+                    in pubs_by_folder.items()
+                ]
+                submitted.append((job, records))
+                # sent and recorded: a retry after a failure skips them
+                del self.requests[:len(requests)]
+        finally:
+            if execution_mode is not None:
+                execution_mode.close()  # no new jobs: lets the batch finish
+        return submitted
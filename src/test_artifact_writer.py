@@ -0,0 +1,50 @@
+from time import sleep
+from unittest import TestCase, main
+
+from artifact_writer import ArtifactWriter
+
+
+class TestArtifactWriter(TestCase):
+
+    def test_should_block_the_caller_only_when_the_queue_is_full(self):
+        # given
+        written = []
+
+        def slow_write(name: str):
+            sleep(.1)
+            written.append(name)
+
+        # when
+        with ArtifactWriter(max_pending=2, io_workers=2) as writer:
+            for name in ['a', 'b', 'c', 'd']:
+                writer.write(slow_write, name)
+            stats = writer.flush()
+
+        # then
+        self.assertEqual(sorted(written), ['a', 'b', 'c', 'd'])
+        self.assertEqual(stats['writes'], 4)
+        self.assertGreater(stats['blocked_seconds'], .05)
+        self.assertGreaterEqual(stats['max_latency'], .1)
+        self.assertGreaterEqual(stats['busy_seconds'], .4)
+
+    def test_should_raise_failures_on_flush_and_count_them(self):
+        # given
+        writer = ArtifactWriter(max_pending=1)
+
+        # when
+        writer.write(len, 'counts')
+        writer.write(open, '/nonexistent/folder/file.csv', 'w')
+
+        # then
+        with self.assertRaises(FileNotFoundError):
+            writer.flush()
+        self.assertEqual((writer.writes, writer.failures), (1, 1))
+        writer.close()
+        for _ in range(2):  # a rejected submit frees its queue slot
+            with self.assertRaises(RuntimeError):
+                writer.write(len, 'counts')
+        self.assertTrue(writer.pending.acquire(timeout=1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+from unittest import TestCase, main
+
+import numpy as np
+from scipy.stats import chi2_contingency
+from qiskit.quantum_info.analysis import hellinger_fidelity
+
+from batch_statistics import adjust_pvalues, batch_stat_tests, stack_counts
+from counts import Counts
+
+
+class TestBatchStatistics(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        ideal = np.array([.05, .4, .05, .4, .1])
+        noisy = np.array([.15, .3, .1, .3, .15])
+        self.expected = rng.multinomial(1000, ideal, size=6)
+        self.actual = np.concatenate([
+            rng.multinomial(800, ideal, size=3),
+            rng.multinomial(800, noisy, size=3)])
+
+    def test_should_match_scipy_chi2_contingency_per_pair(self):
+        # when
+        results = batch_stat_tests(self.expected, self.actual)
+
+        # then
+        for row in range(len(self.expected)):
+            scipy_result = chi2_contingency([self.expected[row], self.actual[row]])
+            self.assertAlmostEqual(
+                results['chi2_contingency']['statistic'][row],
+                scipy_result.statistic)
+            self.assertAlmostEqual(
+                results['chi2_contingency']['pvalue'][row],
+                scipy_result.pvalue)
+
+    def test_should_match_scipy_chi2_contingency_with_yates_correction(self):
+        # given
+        expected = np.array([[30, 70, 0]])
+        actual = np.array([[45, 55, 0]])
+
+        # when
+        results = batch_stat_tests(expected, actual)
+
+        # then
+        scipy_result = chi2_contingency([[30, 70], [45, 55]])
+        self.assertEqual(results['dof'][0], 1)
+        self.assertAlmostEqual(
+            results['chi2_contingency']['statistic'][0], scipy_result.statistic)
+
+    def test_should_compute_distances_per_pair(self):
+        # when
+        results = batch_stat_tests(self.expected, self.actual)
+
+        # then
+        for row in range(len(self.expected)):
+            p = self.expected[row] / self.expected[row].sum()
+            q = self.actual[row] / self.actual[row].sum()
+            self.assertAlmostEqual(results['tvd'][row], .5 * np.abs(p - q).sum())
+            counts_p = {str(i): int(v) for i, v in enumerate(self.expected[row])}
+            counts_q = {str(i): int(v) for i, v in enumerate(self.actual[row])}
+            self.assertAlmostEqual(
+                results['hellinger_fidelity'][row],
+                hellinger_fidelity(counts_p, counts_q))
+
+    def test_should_detect_noisy_pairs_after_correction(self):
+        # when
+        results = batch_stat_tests(self.expected, self.actual, correction='bh')
+
+        # then
+        rejected = results['chi2_contingency']['corrected_pvalue'] < .05
+        np.testing.assert_array_equal(rejected, [False] * 3 + [True] * 3)
+
+    def test_should_adjust_pvalues(self):
+        # given
+        pvalues = np.array([.01, .04, .03, .2])
+
+        # when & then
+        np.testing.assert_allclose(
+            adjust_pvalues(pvalues, 'bonferroni'), [.04, .16, .12, .8])
+        np.testing.assert_allclose(
+            adjust_pvalues(pvalues, 'bh'), [.04, .16 / 3, .16 / 3, .2])
+
+    def test_should_stack_counts_over_observed_outcomes(self):
+        # given
+        pairs = [
+            (Counts.from_dict({'00': 1, '11': 2}), Counts.from_dict({'11': 3})),
+            (Counts.from_dict({'01': 4}), Counts.from_dict({'00': 5})),
+        ]
+
+        # when
+        expected, actual = stack_counts(pairs)
+
+        # then
+        np.testing.assert_array_equal(expected, [[1, 0, 2], [0, 4, 0]])
+        np.testing.assert_array_equal(actual, [[0, 0, 3], [5, 0, 0]])
+
+
+if __name__ == '__main__':
+    main()
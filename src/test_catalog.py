@@ -0,0 +1,79 @@
+from os import chdir, getcwd, remove, sep
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from catalog import RunCatalog, catalog_entry
+from counts import Counts
+from folders import create_artifacts_folder
+from results_store import write_counts
+
+
+class TestRunCatalog(TestCase):
+
+    def setUp(self):
+        self.cwd = getcwd()
+        self.tmp_dir = TemporaryDirectory()
+        chdir(self.tmp_dir.name)
+        self.catalog = RunCatalog('experiments/catalog.sqlite')
+
+        for experiment_id, backend_name, pvalue in [
+                ('grover-9q', 'fake_sherbrooke', .001),
+                ('grover-9q', 'fake_sherbrooke', .4),
+                ('grover-9q', 'fake_manila', .01),
+                ('grover-5q', 'fake_sherbrooke', .02)]:
+            run_folder = create_artifacts_folder(experiment_id)
+            for scenario_id in ['ideal', 'noisy']:
+                file_name = f'{run_folder}/scenario-{scenario_id}'
+                metadata = write_counts(
+                    Counts.from_dict({'01': 10}), file_name, {
+                        'scenario_id': scenario_id,
+                        'backend_name': backend_name,
+                    } | ({'stat_test': {
+                        'name': 'chi2_contingency', 'statistic': 1.,
+                        'pvalue': pvalue}} if scenario_id == 'noisy' else {}))
+                self.catalog.record_result(file_name, metadata)
+
+    def tearDown(self):
+        chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_should_query_runs_by_experiment_backend_and_pvalue(self):
+        # when
+        entries = self.catalog.query(
+            experiment_id='grover-9q', backend_name='fake_sherbrooke',
+            scenario_id='noisy', max_pvalue=.05)
+
+        # then
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['pvalue'], .001)
+        self.assertEqual(entries[0]['shots'], 10)
+        self.assertTrue(entries[0]['run_folder'].endswith('grover-9q/run-1'))
+        self.assertEqual(len(self.catalog.query(experiment_id='grover-9q')), 6)
+
+    def test_should_rebuild_the_catalog_from_disk(self):
+        # given
+        remove(self.catalog.path)
+
+        # when
+        count = self.catalog.rebuild('experiments')
+
+        # then
+        self.assertEqual(count, 8)
+        self.assertEqual(
+            [e['experiment_id'] for e in self.catalog.query(max_pvalue=.05)],
+            ['grover-5q', 'grover-9q', 'grover-9q'])
+
+
+    def test_should_read_date_and_experiment_from_os_paths(self):
+        # when
+        entry = catalog_entry(
+            sep.join(['experiments', '2024-05-01', 'grover-9q', 'run-3',
+                      'scenario-noisy']), {})
+
+        # then
+        self.assertEqual(entry['date'], '2024-05-01')
+        self.assertEqual(entry['experiment_id'], 'grover-9q')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from qiskit import QuantumCircuit, transpile
+from qiskit_ibm_runtime.fake_provider.backends import FakeSherbrooke
+
+from compaction import active_qubits, compact_circuit, compacted_simulator
+from noise_cache import NoiseModelCache
+
+
+def ghz_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(3)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.cx(1, 2)
+    circuit.measure_all()
+    return circuit
+
+
+class TestCompaction(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backend = FakeSherbrooke()
+        cls.circuit = transpile(
+            ghz_circuit(), backend=cls.backend, seed_transpiler=1)
+        cls.tmp_dir = TemporaryDirectory()
+        cls.noise_cache = NoiseModelCache(cls.tmp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_should_keep_only_active_qubits(self):
+        # when
+        compacted = compact_circuit(self.circuit)
+
+        # then
+        self.assertEqual(compacted['active_qubits'], active_qubits(self.circuit))
+        self.assertEqual(
+            compacted['circuit'].num_qubits, len(compacted['active_qubits']))
+        self.assertEqual(compacted['circuit'].num_clbits, 3)
+        self.assertLess(compacted['circuit'].num_qubits, self.backend.num_qubits)
+
+    def test_should_keep_counts_in_original_bit_order(self):
+        # given: only the last bit set, on non-contiguous physical qubits
+        circuit = QuantumCircuit(3)
+        circuit.x(2)
+        circuit.measure_all()
+        transpiled = transpile(
+            circuit, backend=self.backend, initial_layout=[20, 3, 11],
+            seed_transpiler=1)
+        compacted = compact_circuit(transpiled)
+        simulator = compacted_simulator(
+            self.backend, compacted['active_qubits'], ideal=True,
+            noise_cache=self.noise_cache)
+
+        # when
+        counts = simulator.run(
+            compacted['circuit'], shots=100, seed_simulator=1) \
+            .result().get_counts()
+
+        # then
+        self.assertEqual(compacted['active_qubits'], [3, 11, 20])
+        self.assertEqual(counts, {'100': 100})
+
+    def test_should_restrict_noise_to_active_qubits(self):
+        # given
+        compacted = compact_circuit(self.circuit)
+
+        # when
+        simulator = compacted_simulator(
+            self.backend, compacted['active_qubits'],
+            noise_cache=self.noise_cache)
+
+        # then
+        noise_model = simulator.options.noise_model
+        self.assertTrue(all(
+            q < len(compacted['active_qubits'])
+            for q in noise_model.noise_qubits))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+from unittest import TestCase, main
+
+import numpy as np
+from qiskit.primitives.containers import BitArray
+
+from counts import Counts, align
+from mock_result import MockResult
+
+
+class TestCounts(TestCase):
+
+    def test_should_build_dense_counts_from_bitstrings(self):
+        # when
+        counts = Counts.from_dict({'0110': 3, '1001': 5})
+
+        # then
+        self.assertTrue(counts.is_dense)
+        self.assertEqual(counts.values[0b0110], 3)
+        self.assertEqual(counts.values[0b1001], 5)
+        self.assertEqual(counts.shots, 8)
+        self.assertEqual(counts.to_dict(), {'0110': 3, '1001': 5})
+
+    def test_should_build_sparse_counts_for_wide_registers(self):
+        # given
+        wide = '1' + '0' * 39
+
+        # when
+        counts = Counts.from_dict({wide: 2, '0' * 40: 1})
+
+        # then
+        self.assertFalse(counts.is_dense)
+        self.assertEqual(counts.to_dict(), {'0' * 40: 1, wide: 2})
+
+    def test_should_reject_registers_wider_than_64_bits(self):
+        # when / then
+        with self.assertRaisesRegex(ValueError, '65 bits do not fit'):
+            Counts.from_dict({'1' + '0' * 64: 1})
+        with self.assertRaisesRegex(ValueError, '65 bits do not fit'):
+            Counts.from_dict({hex(1 << 64): 1})
+        with self.assertRaisesRegex(ValueError, '80 bits do not fit'):
+            Counts.from_dict({'01': 1}, num_bits=80)
+
+    def test_should_sum_counts_of_different_widths(self):
+        # when
+        counts = Counts.from_dict({'01': 3}) + Counts.from_dict({'001': 4})
+
+        # then
+        self.assertEqual(counts.num_bits, 3)
+        self.assertEqual(counts.to_dict(), {'001': 7})
+
+    def test_should_sum_sparse_counts(self):
+        # given
+        wide = '1' + '0' * 39
+
+        # when
+        counts = Counts.from_dict({wide: 2, '0' * 40: 1}) \
+            + Counts.from_dict({wide: 5})
+
+        # then
+        self.assertFalse(counts.is_dense)
+        self.assertEqual(counts.to_dict(), {'0' * 40: 1, wide: 7})
+        self.assertEqual(counts.shots, 8)
+
+    def test_should_count_bit_array_shots(self):
+        # given
+        bit_array = BitArray.from_samples(['011', '011', '100'], num_bits=3)
+
+        # when
+        counts = Counts.from_bit_array(bit_array)
+
+        # then
+        self.assertEqual(counts.to_dict(), bit_array.get_counts())
+
+    def test_should_align_observed_outcomes_in_order(self):
+        # given
+        expected = Counts.from_result(MockResult({'00': 4, '11': 6}))
+        actual = Counts.from_result(MockResult({'11': 5, '01': 1, '00': 4}))
+
+        # when
+        expected_data, actual_data = align(expected, actual)
+
+        # then
+        np.testing.assert_array_equal(expected_data, [4, 0, 6])
+        np.testing.assert_array_equal(actual_data, [4, 1, 5])
+
+    def test_should_align_sparse_counts(self):
+        # given
+        expected = Counts.from_dict({'1' + '0' * 29: 2, '0' * 30: 1})
+        actual = Counts.from_dict({'0' * 29 + '1': 7, '0' * 30: 3})
+
+        # when
+        expected_data, actual_data = align(expected, actual)
+
+        # then
+        np.testing.assert_array_equal(expected_data, [1, 0, 2])
+        np.testing.assert_array_equal(actual_data, [3, 7, 0])
+
+
+if __name__ == '__main__':
+    main()
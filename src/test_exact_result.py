@@ -0,0 +1,64 @@
+from unittest import TestCase, main
+
+from qiskit import QuantumCircuit, transpile
+from qiskit_ibm_runtime.fake_provider.backends import FakeManilaV2
+
+from exact_result import ExactResult, exact_probabilities
+from mock_result import MockResult
+from statistical_test import stat_test_results
+
+
+def bell_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(3, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.x(2)
+    circuit.measure(0, 0)
+    circuit.measure(2, 1)
+    return circuit
+
+
+class TestExactResult(TestCase):
+
+    def test_should_compute_probabilities_in_clbit_order(self):
+        # given
+        circuit = transpile(
+            bell_circuit(), backend=FakeManilaV2(), seed_transpiler=1)
+
+        # when
+        probabilities = exact_probabilities(circuit)
+
+        # then
+        self.assertEqual(set(probabilities), {'10', '11'})
+        self.assertAlmostEqual(probabilities['10'], .5)
+        self.assertAlmostEqual(probabilities['11'], .5)
+
+    def test_should_sample_counts_only_from_the_support(self):
+        # given
+        result = ExactResult({'10': .5, '11': .5}, shots=1000, seed=1)
+
+        # when
+        counts = result.get_counts()
+
+        # then
+        self.assertEqual(sum(counts.values()), 1000)
+        self.assertTrue(set(counts) <= {'10', '11'})
+        self.assertIs(counts, result.get_counts())
+
+    def test_should_test_counts_against_the_exact_distribution(self):
+        # given
+        expected_result = ExactResult({'10': .5, '11': .5}, shots=1000)
+        same_result = MockResult({'10': 510, '11': 490})
+        noisy_result = MockResult({'10': 480, '11': 470, '00': 50})
+
+        # when
+        same = stat_test_results(expected_result, same_result)
+        noisy = stat_test_results(expected_result, noisy_result)
+
+        # then
+        self.assertGreater(same['chi2_goodness_of_fit']['pvalue'], .05)
+        self.assertEqual(noisy['chi2_goodness_of_fit']['pvalue'], 0)
+
+
+if __name__ == '__main__':
+    main()
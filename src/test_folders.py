@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from os import listdir, makedirs
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from folders import create_run_folder
+
+
+class TestFolders(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_should_follow_numeric_run_order(self):
+        # given: folders from before the hint file existed
+        for run_index in [1, 9, 10]:
+            makedirs(f'{self.tmp_dir.name}/run-{run_index}')
+
+        # when
+        first = create_run_folder(self.tmp_dir.name)
+        second = create_run_folder(self.tmp_dir.name)
+
+        # then
+        self.assertEqual(first, f'{self.tmp_dir.name}/run-11')
+        self.assertEqual(second, f'{self.tmp_dir.name}/run-12')
+
+    def test_should_never_share_a_run_folder_between_writers(self):
+        # when
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            thread_folders = list(executor.map(
+                create_run_folder, [self.tmp_dir.name] * 40))
+        with ProcessPoolExecutor(
+                max_workers=4, mp_context=get_context('spawn')) as executor:
+            process_folders = list(executor.map(
+                create_run_folder, [self.tmp_dir.name] * 20))
+
+        # then
+        folders = thread_folders + process_folders
+        self.assertEqual(len(set(folders)), 60)
+        self.assertEqual(
+            sorted(f for f in listdir(self.tmp_dir.name) if f.startswith('run-')),
+            sorted(f'run-{i}' for i in range(1, 61)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from unittest import TestCase, main
+
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+from qiskit_algorithms import Grover, AmplificationProblem
+from qiskit_ibm_runtime.fake_provider.backends import FakeManilaV2
+
+from grover_circuit import iteration_sweep_circuits, transpile_grover_block
+
+
+def get_problem() -> AmplificationProblem:
+    oracle = QuantumCircuit(3)  # marks '111'
+    oracle.h(2)
+    oracle.ccx(0, 1, 2)
+    oracle.h(2)
+    return AmplificationProblem(oracle, is_good_state=['111'])
+
+
+def measured_probabilities(circuit: QuantumCircuit):
+    measured_qubits = [
+        instruction.qubits[0]
+        for instruction in circuit.data
+        if instruction.operation.name == 'measure'
+    ]
+    statevector = Statevector(circuit.remove_final_measurements(inplace=False))
+    qargs = [circuit.find_bit(q).index for q in measured_qubits]
+    return statevector.probabilities(qargs=qargs)
+
+
+class TestIterationSweep(TestCase):
+
+    def test_sweep_should_match_grover_circuits_for_each_iteration(self):
+        # given
+        backend = FakeManilaV2()
+        problem = get_problem()
+
+        # when
+        block = transpile_grover_block(problem, backend, seed_transpiler=3)
+        circuits = iteration_sweep_circuits(problem, block, 3, backend)
+
+        # then
+        self.assertEqual(len(circuits), 4)
+        for iterations, circuit in enumerate(circuits):
+            expected_circuit = Grover(iterations=iterations) \
+                .construct_circuit(problem, measurement=True)
+            expected = measured_probabilities(expected_circuit)
+            actual = measured_probabilities(circuit)
+            for expected_p, actual_p in zip(expected, actual):
+                self.assertAlmostEqual(expected_p, actual_p)
+
+
+if __name__ == '__main__':
+    main()
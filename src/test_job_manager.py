@@ -0,0 +1,118 @@
+import asyncio
+from os import chdir, getcwd
+from os.path import exists
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from qiskit.primitives.containers import BitArray, DataBin, SamplerPubResult
+from qiskit.primitives.containers.primitive_result import PrimitiveResult
+
+from fake_runtime_service import FakeRuntimeJob, FakeRuntimeService
+from folders import create_artifacts_folder
+from job_manager import \
+    RuntimeJobManager, fetch_results, find_pending_jobs, load_job_records, \
+    record_job
+
+
+def sampler_result(samples: list[str]) -> PrimitiveResult:
+    bit_array = BitArray.from_samples(samples, num_bits=len(samples[0]))
+    return PrimitiveResult([SamplerPubResult(DataBin(meas=bit_array))])
+
+
+class TestRuntimeJobManager(TestCase):
+
+    def setUp(self):
+        self.cwd = getcwd()
+        self.tmp_dir = TemporaryDirectory()
+        chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_should_poll_jobs_concurrently_and_ingest_results(self):
+        # given
+        done_job = FakeRuntimeJob('job-1', sampler_result(['01', '01', '10']))
+        slow_job = FakeRuntimeJob(
+            'job-2', sampler_result(['11']),
+            statuses=['QUEUED'] * 4 + ['DONE'])
+        failed_job = FakeRuntimeJob(
+            'job-3', None, statuses=['RUNNING', 'ERROR'])
+        run_folder = create_artifacts_folder('grover-qhw')
+        for job in [done_job, slow_job, failed_job]:
+            record_job(run_folder, job, 'grover-qhw')
+        manager = RuntimeJobManager(
+            FakeRuntimeService([done_job, slow_job, failed_job]),
+            poll_interval=.001, max_poll_interval=.004)
+
+        # when
+        records = asyncio.run(manager.run(find_pending_jobs('grover-qhw')))
+
+        # then
+        self.assertEqual(
+            [(r['status'], r['ingested']) for r in records],
+            [('DONE', True), ('DONE', True), ('ERROR', False)])
+        self.assertEqual(slow_job.status_calls, 5)
+        self.assertEqual(
+            [r['status'] for r in load_job_records(run_folder)],
+            ['DONE', 'DONE', 'ERROR'])
+        with open(f'{run_folder}/grover-qhw.job-1.counts.csv', encoding='utf-8') as file:
+            self.assertIn('01,2\n', file.read())
+        self.assertEqual(find_pending_jobs('grover-qhw'), [])
+
+    def test_should_retry_ingesting_done_jobs_on_the_next_run(self):
+        # given
+        flaky_job = FakeRuntimeJob('job-1', sampler_result(['01', '10']))
+        other_job = FakeRuntimeJob('job-2', sampler_result(['11']))
+        run_folder = create_artifacts_folder('grover-qhw')
+        for job in [flaky_job, other_job]:
+            record_job(run_folder, job, 'grover-qhw')
+        ingested = []
+
+        def flaky_ingest(record, result):
+            if record['job_id'] == 'job-1' and 'failed' not in ingested:
+                ingested.append('failed')
+                raise OSError('disk full')
+            ingested.append(record['job_id'])
+
+        manager = RuntimeJobManager(
+            FakeRuntimeService([flaky_job, other_job]), poll_interval=.001,
+            ingest=flaky_ingest)
+        with self.assertRaises(OSError):
+            asyncio.run(manager.run(find_pending_jobs('grover-qhw')))
+        pending = find_pending_jobs('grover-qhw')
+        self.assertEqual(
+            [(r['job_id'], r['status'], r['ingested']) for r in pending],
+            [('job-1', 'DONE', False)])
+        self.assertIn('disk full', pending[0]['error'])
+
+        # when
+        records = asyncio.run(manager.run(pending))
+
+        # then
+        self.assertEqual(
+            [(r['status'], r['ingested'], r['error']) for r in records],
+            [('DONE', True, None)])
+        self.assertEqual(sorted(ingested), ['failed', 'job-1', 'job-2'])
+        self.assertEqual(find_pending_jobs('grover-qhw'), [])
+
+    def test_should_require_a_run_folder_for_job_ids(self):
+        with self.assertRaises(ValueError):
+            fetch_results(FakeRuntimeService([]), 'grover-qhw', ['job-1'])
+
+    def test_should_record_a_job_once(self):
+        # given
+        job = FakeRuntimeJob('job-1', None)
+        run_folder = create_artifacts_folder('grover-qhw')
+
+        # when
+        record_job(run_folder, job, 'grover-qhw')
+        record_job(run_folder, job, 'grover-qhw')
+
+        # then
+        self.assertTrue(exists(f'{run_folder}/jobs.json'))
+        self.assertEqual(len(load_job_records(run_folder)), 1)
+
+
+if __name__ == '__main__':
+    main()
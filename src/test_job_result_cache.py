@@ -0,0 +1,77 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+from qiskit.primitives.containers import BitArray, DataBin, SamplerPubResult
+from qiskit.primitives.containers.primitive_result import PrimitiveResult
+
+from fake_runtime_service import FakeRuntimeJob, FakeRuntimeService
+from job_result_cache import JobResultCache, fetch_job_results
+
+
+def sampler_result(samples: list[str]) -> PrimitiveResult:
+    bit_array = BitArray.from_samples(samples, num_bits=len(samples[0]))
+    return PrimitiveResult(
+        [SamplerPubResult(DataBin(meas=bit_array), {'shots': len(samples)})],
+        {'version': 2})
+
+
+class TestJobResultCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.cache = JobResultCache(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_should_keep_packed_bits_and_metadata(self):
+        # given
+        result = sampler_result(['000000001', '100000000', '100000000'])
+
+        # when
+        self.cache.put('job-1', result)
+        cached_result = self.cache.get('job-1')
+
+        # then
+        bit_array = cached_result[0].data.meas
+        np.testing.assert_array_equal(bit_array.array, result[0].data.meas.array)
+        self.assertEqual(bit_array.num_bits, 9)
+        self.assertEqual(bit_array.get_counts(), {'000000001': 1, '100000000': 2})
+        self.assertEqual(cached_result[0].metadata, {'shots': 3})
+        self.assertEqual(cached_result.metadata, {'version': 2})
+        self.assertIsNone(self.cache.get('job-2'))
+
+    def test_should_drop_a_truncated_entry(self):
+        # given
+        self.cache.put('job-1', sampler_result(['01', '10']))
+        entry_path = self.cache._entry_path('job-1')
+        entry_path.write_bytes(entry_path.read_bytes()[:100])
+
+        # when
+        cached_result = self.cache.get('job-1')
+
+        # then
+        self.assertIsNone(cached_result)
+        self.assertNotIn('job-1', self.cache)
+
+    def test_should_fetch_only_uncached_jobs(self):
+        # given
+        service = FakeRuntimeService([
+            FakeRuntimeJob(f'job-{i}', sampler_result([format(i, '03b')]))
+            for i in range(6)
+        ])
+        self.cache.put('job-0', sampler_result(['000']))
+
+        # when
+        results = fetch_job_results(
+            service, [f'job-{i}' for i in range(6)], self.cache, max_concurrency=3)
+        fetch_job_results(service, ['job-5', 'job-2'], self.cache)
+
+        # then
+        self.assertEqual(service.job_calls, 5)
+        self.assertEqual(results['job-5'][0].data.meas.get_counts(), {'101': 1})
+
+
+if __name__ == '__main__':
+    main()
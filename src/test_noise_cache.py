@@ -0,0 +1,46 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from qiskit_ibm_runtime.fake_provider.backends import FakeManilaV2
+
+from noise_cache import NoiseModelCache
+
+
+class TestNoiseModelCache(TestCase):
+
+    def test_should_persist_device_errors_by_calibration(self):
+        # given
+        backend = FakeManilaV2()
+        with TemporaryDirectory() as path:
+            NoiseModelCache(path).device_errors(backend)
+
+            # when
+            device_errors = NoiseModelCache(path).device_errors(backend)
+
+            # then
+            self.assertTrue((NoiseModelCache(path).path / \
+                f'{NoiseModelCache(path).key(backend)}.pickle').exists())
+            self.assertEqual(len(device_errors['readout_errors']), 5)
+
+    def test_should_restrict_noise_to_qubits_and_gates(self):
+        # given
+        backend = FakeManilaV2()
+        with TemporaryDirectory() as path:
+            cache = NoiseModelCache(path)
+
+            # when
+            noise_model = cache.restricted_noise_model(
+                backend, [3, 4], gates={'cx', 'measure'})
+
+            # then
+            self.assertEqual(sorted(noise_model.noise_qubits), [0, 1])
+            self.assertEqual(
+                set(noise_model.noise_instructions), {'cx', 'measure'})
+            self.assertIs(
+                noise_model,
+                cache.restricted_noise_model(
+                    backend, [3, 4], gates={'cx', 'measure'}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import simplejson
+
+from profiler import \
+    Profiler, current_span_id, export_chrome_trace, export_jsonl, \
+    load_spans, summarize
+
+
+class TestProfiler(TestCase):
+
+    def test_should_nest_spans_across_threads_with_a_copied_context(self):
+        # given
+        profiler = Profiler()
+
+        def simulate(scenario_id: str):
+            with profiler.span('simulation', scenario_id=scenario_id):
+                pass
+
+        # when
+        with profiler.span('experiment', experiment_id='grover-5q'):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                for future in [
+                        executor.submit(copy_context().run, simulate, s)
+                        for s in ['ideal', 'noisy']]:
+                    future.result()
+
+        # then
+        experiment = next(
+            s for s in profiler.spans if s['name'] == 'experiment')
+        simulations = [s for s in profiler.spans if s['name'] == 'simulation']
+        self.assertIsNone(experiment['parent_id'])
+        self.assertEqual(
+            [s['parent_id'] for s in simulations], [experiment['span_id']] * 2)
+        self.assertEqual(
+            sorted(s['attributes']['scenario_id'] for s in simulations),
+            ['ideal', 'noisy'])
+        self.assertTrue(all(
+            s['duration_ns'] <= experiment['duration_ns'] for s in simulations))
+
+    def test_should_export_and_aggregate_profiles_across_runs(self):
+        # given
+        profiler = Profiler()
+        with TemporaryDirectory() as folder:
+            for run in range(2):
+                with profiler.span('experiment', run=run):
+                    root_span_id = current_span_id()
+                    with profiler.span('transpile'):
+                        with profiler.span('grover_construction'):
+                            pass
+                spans = profiler.take_subtrees([root_span_id])
+                export_jsonl(spans, f'{folder}/run-{run}.jsonl')
+            export_chrome_trace(spans, f'{folder}/trace.json')
+
+            # when
+            spans = load_spans(f'{folder}/*.jsonl')
+            summaries = summarize(spans)
+            with open(f'{folder}/trace.json', encoding='utf-8') as file:
+                trace = simplejson.load(file)
+
+        # then
+        self.assertEqual(len(profiler.spans), 0)
+        self.assertEqual(len(spans), 6)
+        self.assertEqual(
+            {s['name']: s['count'] for s in summaries},
+            {'experiment': 2, 'transpile': 2, 'grover_construction': 2})
+        self.assertEqual(summaries[0]['name'], 'experiment')
+        self.assertEqual(len(trace['traceEvents']), 3)
+        self.assertTrue(all(e['ph'] == 'X' for e in trace['traceEvents']))
+
+    def test_should_take_only_the_spans_of_one_experiment(self):
+        # given
+        profiler = Profiler(max_spans=10)
+        root_span_ids = {}
+
+        def run(experiment_id: str):
+            with profiler.span('experiment', experiment_id=experiment_id):
+                root_span_ids[experiment_id] = current_span_id()
+                for _ in range(3):
+                    with profiler.span('simulation'):
+                        pass
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(run, ['grover-5q', 'grover-9q']))
+
+        # when
+        spans = profiler.take_subtrees([root_span_ids['grover-5q']])
+
+        # then
+        self.assertEqual(len(spans), 4)
+        self.assertEqual(spans[0]['attributes'], {'experiment_id': 'grover-5q'})
+        self.assertEqual(
+            {s['parent_id'] for s in spans[1:]}, {root_span_ids['grover-5q']})
+        self.assertEqual(len(profiler.spans), 4)
+        for _ in range(20):
+            with profiler.span('orphan'):
+                pass
+        self.assertEqual(len(profiler.spans), 10)
+
+
+if __name__ == '__main__':
+    main()
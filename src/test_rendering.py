@@ -0,0 +1,67 @@
+from os.path import exists
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from qiskit import QuantumCircuit
+
+from counts import Counts
+from rendering import \
+    load_render_jobs, record_circuit_render, record_histogram_render, \
+    render_pending
+from results_store import write_counts
+
+
+class TestRendering(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        run_folder = self.tmp_dir.name
+        circuit = QuantumCircuit(2, name='bell')
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+        record_circuit_render(run_folder, circuit, f'{run_folder}/bell')
+        write_counts(
+            Counts.from_dict({'00': 510, '11': 490}), f'{run_folder}/scenario-ideal')
+        record_histogram_render(run_folder, f'{run_folder}/scenario-ideal')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_should_record_jobs_without_rendering(self):
+        # then
+        self.assertEqual(
+            [job['kind'] for job in load_render_jobs(self.tmp_dir.name)],
+            ['circuit', 'histogram'])
+        self.assertFalse(exists(f'{self.tmp_dir.name}/bell.circuit.png'))
+
+    def test_should_render_pending_jobs_once(self):
+        # when
+        outputs = render_pending(self.tmp_dir.name, max_workers=1)
+        text_outputs = render_pending(self.tmp_dir.name, text=True)
+
+        # then
+        self.assertEqual(outputs, [
+            f'{self.tmp_dir.name}/bell.circuit.png',
+            f'{self.tmp_dir.name}/scenario-ideal.histogram.png'])
+        self.assertTrue(all(exists(output) for output in outputs))
+        self.assertEqual(render_pending(self.tmp_dir.name), [])
+        with open(text_outputs[1], encoding='utf-8') as file:
+            self.assertIn('00 510\n', file.read())
+
+
+    def test_should_not_retry_a_job_that_fell_back_to_text(self):
+        # given
+        text_outputs = render_pending(self.tmp_dir.name, text=True)
+
+        # when
+        outputs = render_pending(self.tmp_dir.name, max_workers=1)
+
+        # then
+        self.assertEqual(len(text_outputs), 2)
+        self.assertEqual(outputs, [])
+        self.assertFalse(exists(f'{self.tmp_dir.name}/bell.circuit.png'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+from qiskit import QuantumCircuit, transpile
+from qiskit_ibm_runtime.fake_provider.backends import FakeManilaV2
+
+from noise_cache import default_noise_cache
+from replicates import ReplicateRunner, run_replicate_statistics
+from scenario import Scenario
+
+
+def ghz_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(3)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.cx(1, 2)
+    circuit.measure_all()
+    return circuit
+
+
+class TestReplicates(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backend = FakeManilaV2()
+        cls.circuit = transpile(
+            ghz_circuit(), backend=cls.backend, seed_transpiler=1)
+        # the scenarios build their noise through the default cache: keep
+        #   its pickles out of the source tree
+        cls.tmp_dir = TemporaryDirectory()
+        cls.noise_cache_path = default_noise_cache.path
+        default_noise_cache.path = Path(cls.tmp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        default_noise_cache.path = cls.noise_cache_path
+        cls.tmp_dir.cleanup()
+
+    def test_seeded_replicates_should_be_reproducible_and_distinct(self):
+        # given
+        scenario = Scenario(
+            id='ideal', backend=self.backend, shots=500, compact=True, ideal=True)
+
+        # when
+        first = ReplicateRunner(self.circuit, scenario, 5, seed=3).run()
+        second = ReplicateRunner(self.circuit, scenario, 5, seed=3).run()
+
+        # then
+        self.assertEqual(
+            [c.to_dict() for c in first], [c.to_dict() for c in second])
+        self.assertNotEqual(first[0].to_dict(), first[1].to_dict())
+        self.assertEqual({c.shots for c in first}, {500})
+
+    def test_ideal_pvalues_should_be_uniform_and_noisy_ones_small(self):
+        # given
+        ideal_scenario = Scenario(
+            id='ideal', backend=self.backend, shots=2000, exact=True)
+        other_ideal_scenario = Scenario(
+            id='ideal-2', backend=self.backend, shots=2000,
+            compact=True, ideal=True)
+        noisy_scenario = Scenario(
+            id='noisy', backend=self.backend, shots=2000, compact=True)
+
+        # when
+        ideal_statistics = run_replicate_statistics(
+            self.circuit, ideal_scenario, other_ideal_scenario, 200, seed=1)
+        noisy_statistics = run_replicate_statistics(
+            self.circuit, ideal_scenario, noisy_scenario, 20, seed=1)
+
+        # then
+        self.assertEqual(len(ideal_statistics['chi2_pvalue']), 200)
+        self.assertLess(np.mean(np.array(ideal_statistics['chi2_pvalue']) < .05), .12)
+        self.assertLess(max(noisy_statistics['chi2_pvalue']), .05)
+        self.assertGreater(ideal_statistics['replicates_per_second'], 0)
+
+
+if __name__ == '__main__':
+    main()
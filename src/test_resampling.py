@@ -0,0 +1,60 @@
+from unittest import TestCase, main
+
+import numpy as np
+from scipy.stats import chi2_contingency
+
+from resampling import resampling_test
+
+PROBABILITIES = np.array([.45, .45] + [.1 / 14] * 14)
+
+
+class TestResampling(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.expected = rng.multinomial(10000, PROBABILITIES)
+        self.actual = rng.multinomial(10000, PROBABILITIES)
+
+    def test_permutation_pvalue_should_agree_with_chi2_contingency(self):
+        # given
+        asymptotic_pvalue = chi2_contingency(
+            [self.expected, self.actual], correction=False).pvalue
+
+        # when
+        result = resampling_test(
+            self.expected, self.actual, replicates=20000, seed=1)
+
+        # then
+        low, high = result['pvalue_ci']
+        self.assertLess(low, result['pvalue'])
+        self.assertLess(result['pvalue'], high)
+        self.assertAlmostEqual(result['pvalue'], asymptotic_pvalue, delta=.02)
+
+    def test_seeded_result_should_not_depend_on_workers(self):
+        # when
+        serial = resampling_test(
+            self.expected, self.actual, method='bootstrap',
+            replicates=3000, seed=1)
+        parallel = resampling_test(
+            self.expected, self.actual, method='bootstrap',
+            replicates=3000, seed=1, max_workers=2)
+
+        # then
+        self.assertEqual(serial['exceedances'], parallel['exceedances'])
+
+    def test_should_reject_a_shifted_distribution(self):
+        # given
+        shifted = PROBABILITIES.copy()
+        shifted[0], shifted[1] = .5, .4
+
+        # when
+        result = resampling_test(
+            self.expected, np.random.default_rng(2).multinomial(10000, shifted),
+            statistic='tvd', replicates=2000, seed=1)
+
+        # then
+        self.assertLess(result['pvalue'], .001)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import tracemalloc
+from time import sleep
+from unittest import TestCase, main
+
+import numpy as np
+
+from profiler import Profiler
+from resource_usage import ResourceMonitor
+
+MB = 2**20
+
+
+class TestResourceUsage(TestCase):
+
+    def test_should_record_peak_memory_of_a_stage(self):
+        # given
+        monitor = ResourceMonitor(trace_python=True)
+
+        # when
+        with monitor.stage('simulation', scenario_id='noisy'):
+            array = np.ones(100 * MB // 8)  # touched: resident
+            sleep(.1)  # let the sampler see it
+            del array
+
+        # then
+        [record] = monitor.records
+        self.assertEqual(record['attributes'], {'scenario_id': 'noisy'})
+        self.assertGreater(
+            record['rss_peak_bytes'] - record['rss_start_bytes'], 50 * MB)
+        self.assertGreaterEqual(record['python_peak_bytes'], 100 * MB)
+        self.assertGreaterEqual(record['threads_peak'], 2)  # + the sampler
+        self.assertGreaterEqual(record['cpu_seconds'], 0)
+
+    def test_should_leave_python_allocations_untraced_by_default(self):
+        # given
+        monitor = ResourceMonitor()
+
+        # when
+        with monitor.stage('transpile'):
+            pass
+
+        # then
+        [record] = monitor.records
+        self.assertIsNone(record['python_peak_bytes'])
+        self.assertGreater(record['rss_peak_bytes'], 0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_should_keep_nested_peaks_and_measure_only_stage_spans(self):
+        # given
+        monitor = ResourceMonitor(trace_python=True)
+        profiler = Profiler()
+        profiler.hooks.append(monitor.hook)
+
+        # when
+        with profiler.span('stats'):
+            with profiler.span('transpile'):
+                array = np.ones(50 * MB // 8)
+                del array
+            with profiler.span('not_a_stage'):
+                pass
+
+        # then
+        records = {r['stage']: r for r in monitor.records}
+        self.assertEqual(set(records), {'stats', 'transpile'})
+        self.assertGreaterEqual(records['transpile']['python_peak_bytes'], 50 * MB)
+        # the inner stage reset the tracemalloc peak: it is kept by the outer
+        self.assertGreaterEqual(records['stats']['python_peak_bytes'], 50 * MB)
+        self.assertEqual(len(profiler.spans), 3)
+        taken = monitor.take_records({s['span_id'] for s in profiler.spans})
+        self.assertEqual(len(taken), 2)
+        self.assertEqual(len(monitor.records), 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+
+from counts import Counts
+from results_store import load_campaign, read_counts, write_counts
+from utils import write_results_csv
+
+
+class TestResultsStore(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_should_memory_map_dense_and_sparse_counts(self):
+        # given
+        dense = Counts.from_dict({'0110': 5, '1001': 3})
+        sparse = Counts.from_dict({'1' * 30: 7, '0' * 30: 2})
+
+        # when
+        write_counts(dense, f'{self.tmp_dir.name}/dense', {'job_id': 'job-1'})
+        write_counts(sparse, f'{self.tmp_dir.name}/sparse')
+        dense_read = read_counts(f'{self.tmp_dir.name}/dense')
+        sparse_read = read_counts(f'{self.tmp_dir.name}/sparse')
+
+        # then
+        self.assertIsInstance(dense_read.values, np.memmap)
+        self.assertEqual(dense_read.to_dict(), dense.to_dict())
+        self.assertEqual(sparse_read.to_dict(), sparse.to_dict())
+        self.assertFalse(sparse_read.is_dense)
+
+    def test_should_load_a_campaign_of_compressed_results(self):
+        # given
+        for i in range(3):
+            write_counts(
+                Counts.from_dict({format(i, '03b'): 10 + i}),
+                f'{self.tmp_dir.name}/scenario-{i}', compress=True)
+
+        # when
+        campaign = load_campaign(self.tmp_dir.name)
+
+        # then
+        self.assertEqual(
+            [c.to_dict() for c in campaign.values()],
+            [{'000': 10}, {'001': 11}, {'010': 12}])
+
+    def test_should_write_counts_csv_sorted_by_outcome(self):
+        # given
+        counts = Counts.from_dict({'10': 1, '01': 2, '11': 3})
+        file_name = f'{self.tmp_dir.name}/scenario'
+
+        # when
+        write_results_csv(counts, file_name)
+
+        # then
+        with open(f'{file_name}.counts.csv', encoding='utf-8') as file:
+            self.assertEqual(file.read(), 'cbits,counts\n01,2\n10,1\n11,3\n')
+
+
+if __name__ == '__main__':
+    main()
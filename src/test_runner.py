@@ -0,0 +1,49 @@
+from unittest import TestCase, main
+
+from qiskit import QuantumCircuit, transpile
+from qiskit_aer import AerSimulator
+from qiskit_ibm_runtime.fake_provider.backends import FakeManilaV2
+
+from runner import ConcurrentScenarioRunner, aer_thread_budget
+from scenario import Scenario
+
+
+class TestConcurrentScenarioRunner(TestCase):
+
+    def test_should_yield_every_scenario_result(self):
+        # given
+        reference_backend = FakeManilaV2()
+        ideal_backend = AerSimulator.from_backend(reference_backend)
+        ideal_backend.set_options(method='statevector', noise_model=None)
+        circuit = QuantumCircuit(2)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+        circuit = transpile(circuit, backend=reference_backend)
+        scenarios = [
+            Scenario(id='noisy', backend=reference_backend, shots=100),
+            Scenario(id='ideal', backend=ideal_backend, shots=200)
+        ]
+
+        # when
+        results = {
+            scenario['id']: result
+            for scenario, result in ConcurrentScenarioRunner(
+                circuit, scenarios).run()
+        }
+
+        # then
+        self.assertEqual(sum(results['noisy'].get_counts().values()), 100)
+        self.assertEqual(sum(results['ideal'].get_counts().values()), 200)
+
+    def test_should_split_threads_between_concurrent_simulations(self):
+        # when
+        run_options = aer_thread_budget(AerSimulator(), num_concurrent=2)
+
+        # then
+        self.assertGreaterEqual(run_options['max_parallel_threads'], 1)
+        self.assertEqual(run_options['max_parallel_experiments'], 1)
+
+
+if __name__ == '__main__':
+    main()
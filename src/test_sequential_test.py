@@ -0,0 +1,82 @@
+from unittest import TestCase, main
+
+from qiskit import QuantumCircuit, transpile
+from qiskit_aer import AerSimulator
+from qiskit_ibm_runtime.fake_provider.backends import FakeManilaV2
+
+from exact_result import ExactResult
+from scenario import Scenario
+from sequential_test import SequentialScenarioRunner, alpha_spending
+
+
+def ghz_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(3)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.cx(1, 2)
+    circuit.measure_all()
+    return circuit
+
+
+class TestSequentialScenarioRunner(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backend = FakeManilaV2()
+        cls.circuit = transpile(
+            ghz_circuit(), backend=cls.backend, seed_transpiler=1)
+        cls.reference_result = ExactResult.from_circuit(cls.circuit, shots=0)
+
+    def test_should_spend_at_most_alpha(self):
+        self.assertAlmostEqual(alpha_spending(1., .05), .05)
+        self.assertLess(alpha_spending(.1, .05), .001)
+
+    def test_should_stop_early_on_a_noisy_scenario(self):
+        # given
+        scenario = Scenario(id='noisy', backend=self.backend, shots=20000)
+
+        # when
+        counts, result = SequentialScenarioRunner(
+            self.circuit, scenario, self.reference_result,
+            chunk_shots=1000).run()
+
+        # then
+        self.assertTrue(result['rejected'])
+        self.assertTrue(result['stopped_early'])
+        self.assertEqual(counts.shots, result['shots_used'])
+        self.assertLess(result['shots_used'], result['shots_budget'])
+
+    def test_should_use_the_budget_on_an_ideal_scenario(self):
+        # given
+        ideal_backend = AerSimulator(method='statevector')
+        scenario = Scenario(id='ideal', backend=ideal_backend, shots=3000)
+
+        # when
+        counts, result = SequentialScenarioRunner(
+            self.circuit, scenario, self.reference_result,
+            chunk_shots=1000, alpha=1e-6).run()
+
+        # then
+        self.assertFalse(result['rejected'])
+        self.assertEqual(result['shots_used'], 3000)
+        self.assertEqual(result['looks'], 3)
+        self.assertEqual(set(counts.get_counts()), {'000', '111'})
+
+    def test_should_stop_early_against_a_sampled_reference(self):
+        # given
+        reference_result = AerSimulator(method='statevector').run(
+            self.circuit, shots=20000, seed_simulator=1).result()
+        scenario = Scenario(id='noisy', backend=self.backend, shots=20000)
+
+        # when
+        _, result = SequentialScenarioRunner(
+            self.circuit, scenario, reference_result,
+            chunk_shots=1000).run()
+
+        # then
+        self.assertTrue(result['rejected'])
+        self.assertTrue(result['stopped_early'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+from qiskit.primitives.containers import BitArray
+
+from shot_data import \
+    drift, load_shots, marginal_counts, shot_counts, write_shots
+
+PROBABILITIES = np.array([.45, .45] + [.1 / 510] * 510)
+
+
+def sample_bit_array(shots: int, probabilities, seed: int) -> BitArray:
+    outcomes = np.random.default_rng(seed).choice(
+        len(probabilities), size=shots, p=probabilities)
+    return BitArray.from_samples(outcomes.tolist(), num_bits=9)
+
+
+class TestShotData(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_should_count_memory_mapped_shots_as_bit_array(self):
+        # given
+        bit_array = sample_bit_array(20000, PROBABILITIES, seed=1)
+        file_name = f'{self.tmp_dir.name}/grover-9q'
+
+        # when
+        write_shots(bit_array, file_name)
+        loaded = load_shots(file_name)
+
+        # then
+        self.assertIsInstance(loaded.array, np.memmap)
+        self.assertEqual(
+            shot_counts(loaded, chunk_shots=3000).to_dict(),
+            bit_array.get_counts())
+        self.assertEqual(
+            marginal_counts(loaded, [0, 3, 8], chunk_shots=3000).to_dict(),
+            bit_array.slice_bits([0, 3, 8]).get_counts())
+
+    def test_should_count_wide_registers_across_chunks(self):
+        # given
+        outcomes = np.random.default_rng(3).integers(0, 1 << 24, size=5000)
+        outcomes[:2500] = 5  # repeated across chunks
+        bit_array = BitArray.from_samples(outcomes.tolist(), num_bits=24)
+
+        # when
+        counts = shot_counts(bit_array, chunk_shots=1000)
+        marginal = marginal_counts(bit_array, list(range(22)), chunk_shots=1000)
+
+        # then
+        self.assertFalse(counts.is_dense)
+        self.assertEqual(counts.shots, 5000)
+        self.assertEqual(counts.to_dict(), bit_array.get_counts())
+        self.assertEqual(marginal.shots, 5000)
+        self.assertEqual(
+            marginal.to_dict(),
+            bit_array.slice_bits(list(range(22))).get_counts())
+
+    def test_should_detect_drift_over_the_run(self):
+        # given
+        drifted = PROBABILITIES.copy()
+        drifted[0], drifted[1] = .55, .35
+        stable = sample_bit_array(20000, PROBABILITIES, seed=1)
+        drifting = BitArray.concatenate_shots(
+            [stable, sample_bit_array(20000, drifted, seed=2)])
+
+        # when
+        stable_drift = drift(stable, window_shots=2000)
+        drifting_drift = drift(drifting, window_shots=2000)
+
+        # then
+        self.assertEqual(drifting_drift['windows'], 20)
+        self.assertGreater(stable_drift['pvalue'], .01)
+        self.assertLess(drifting_drift['pvalue'], 1e-6)
+        with self.assertRaises(ValueError):
+            drift(stable, window_shots=30000)
+
+
+if __name__ == '__main__':
+    main()
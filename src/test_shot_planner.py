@@ -0,0 +1,71 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from batch_statistics import batch_stat_tests
+from scenario import Scenario
+from shot_planner import \
+    chi2_power, effect_size, fill_scenario_shots, \
+    least_favorable_alternative, plan_shots
+
+GROVER_LIKE = np.array([.45, .45] + [.1 / 14] * 14)
+
+
+class TestShotPlanner(TestCase):
+
+    def test_alternative_should_be_at_the_requested_tvd(self):
+        # when
+        alternative = least_favorable_alternative(GROVER_LIKE, .05)
+
+        # then
+        self.assertAlmostEqual(alternative.sum(), 1)
+        self.assertAlmostEqual(.5 * np.abs(alternative - GROVER_LIKE).sum(), .05)
+
+    def test_should_plan_the_minimum_shots_with_the_power(self):
+        # given
+        w = effect_size(
+            GROVER_LIKE, least_favorable_alternative(GROVER_LIKE, .05))
+        dof = len(GROVER_LIKE) - 1
+
+        # when
+        shots = plan_shots(GROVER_LIKE, min_tvd=.05, alpha=.05, power=.8)
+
+        # then
+        self.assertGreaterEqual(chi2_power(shots, w, dof), .8)
+        self.assertLess(chi2_power(shots - 1, w, dof), .8)
+        self.assertGreater(plan_shots(GROVER_LIKE, min_tvd=.02), shots)
+
+    def test_planned_shots_should_reach_the_power_empirically(self):
+        # given
+        shots = plan_shots(GROVER_LIKE, min_tvd=.05, alpha=.05, power=.8)
+        alternative = least_favorable_alternative(GROVER_LIKE, .05)
+        rng = np.random.default_rng(1)
+
+        # when
+        results = batch_stat_tests(
+            rng.multinomial(shots, GROVER_LIKE, size=2000),
+            rng.multinomial(shots, alternative, size=2000))
+
+        # then
+        empirical_power = (results['chi2_contingency']['pvalue'] < .05).mean()
+        self.assertAlmostEqual(empirical_power, .8, delta=.04)
+
+    def test_should_fill_scenarios_without_shots(self):
+        # given
+        scenarios = [
+            Scenario(id='noisy', backend=None),
+            Scenario(id='ideal', backend=None, shots=123, exact=True)
+        ]
+
+        # when
+        fill_scenario_shots(scenarios, GROVER_LIKE, min_tvd=.05)
+
+        # then
+        self.assertEqual(
+            scenarios[0]['shots'],
+            plan_shots(GROVER_LIKE, .05, two_sample=False))
+        self.assertEqual(scenarios[1]['shots'], 123)
+
+
+if __name__ == '__main__':
+    main()
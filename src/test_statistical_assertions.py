@@ -3,7 +3,7 @@ from unittest import TestCase, main
 from mock_result import MockResult
 from statistical_assertions import \
     assertIsNormalShapiro, assertSameDistributionKomogorov, \
-    assertSameDistributionMannWhitneyU
+    assertSameDistributionMannWhitneyU, assertSameDistributionPermutation
 
 
 class TestStatisticalAssertions(TestCase):
@@ -138,6 +138,43 @@ class TestStatisticalAssertions(TestCase):
         # when & then: does not raises exception
         assertSameDistributionKomogorov(expected_result, actual_result)
 
+    def test_should_assert_not_same_distribution_by_permutation(self):
+        # given
+        expected_result = MockResult({
+            "0110": 2005,
+            "1001": 1877,
+            "1111": 16
+        })
+
+        actual_result = MockResult({
+            "0110": 1089,
+            "1001": 1017,
+            "1111": 105
+        })
+
+        # when & then
+        with self.assertRaises(AssertionError):
+            assertSameDistributionPermutation(
+                expected_result, actual_result, seed=7)
+
+    def test_should_assert_same_distribution_by_permutation(self):
+        # given
+        expected_result = MockResult({
+            "0110": 2005,
+            "1001": 1877,
+            "1111": 16
+        })
+
+        actual_result = MockResult({
+            "0110": 1969,
+            "1001": 1911,
+            "1111": 18
+        })
+
+        # when & then: does not raises exception
+        assertSameDistributionPermutation(
+            expected_result, actual_result, seed=7)
+
 
 if __name__ == '__main__':
     main()
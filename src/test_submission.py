@@ -0,0 +1,122 @@
+import asyncio
+from os import chdir, getcwd, listdir
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from qiskit import QuantumCircuit, transpile
+from qiskit_ibm_runtime.fake_provider.backends import FakeManilaV2
+
+from fake_runtime_service import FakeRuntimeJob, FakeRuntimeService
+from folders import create_artifacts_folder
+from job_manager import RuntimeJobManager, find_pending_jobs, load_job_records
+from submission import HardwareSubmission
+
+
+def ghz_circuit(num_qubits: int) -> QuantumCircuit:
+    circuit = QuantumCircuit(num_qubits)
+    circuit.h(0)
+    for qubit in range(num_qubits - 1):
+        circuit.cx(qubit, qubit + 1)
+    circuit.measure_all()
+    return circuit
+
+
+class FakeBatch:
+
+    closed = 0
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def close(self):
+        FakeBatch.closed += 1
+
+
+class FlakySampler:
+    """
+    Fails the second job submission once
+    """
+    runs = 0
+
+    def __init__(self, mode):
+        self.mode = mode
+
+    def run(self, pubs):
+        FlakySampler.runs += 1
+        if FlakySampler.runs == 2:
+            raise ConnectionError('submission failed')
+        return FakeRuntimeJob(f'job-{FlakySampler.runs}', None)
+
+
+class TestHardwareSubmission(TestCase):
+
+    def setUp(self):
+        self.cwd = getcwd()
+        self.tmp_dir = TemporaryDirectory()
+        chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_should_batch_pubs_and_split_results_per_run_folder(self):
+        # given: local testing mode runs the batch on the fake backend
+        backend = FakeManilaV2()
+        submission = HardwareSubmission(backend, max_pubs_per_job=2)
+        folder_2q = create_artifacts_folder('ghz-2q')
+        folder_3q = create_artifacts_folder('ghz-3q')
+        submission.add('ghz-2q', folder_2q, transpile(ghz_circuit(2), backend), 100)
+        submission.add('ghz-3q', folder_3q, transpile(ghz_circuit(3), backend), 200, 'k-0')
+        submission.add('ghz-3q', folder_3q, transpile(ghz_circuit(3), backend), 300, 'k-1')
+
+        # when
+        submitted = submission.submit()
+        jobs = [job for job, _ in submitted]
+        records = asyncio.run(RuntimeJobManager(
+            FakeRuntimeService(jobs), poll_interval=.01
+        ).run(find_pending_jobs()))
+
+        # then
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual(
+            [len(job_records) for _, job_records in submitted], [2, 1])
+        self.assertEqual(
+            [pub['label'] for record in load_job_records(folder_3q)
+             for pub in record['pubs']], ['k-0', 'k-1'])
+        self.assertTrue(all(r['ingested'] for r in records))
+        self.assertEqual(
+            sorted(f for f in listdir(folder_3q) if f.endswith('.csv')),
+            sorted([f'ghz-3q.{jobs[0].job_id()}.k-0.counts.csv',
+                    f'ghz-3q.{jobs[1].job_id()}.k-1.counts.csv']))
+        self.assertEqual(
+            [f for f in listdir(folder_2q) if f.endswith('.csv')],
+            [f'ghz-2q.{jobs[0].job_id()}.counts.csv'])
+
+    @patch('submission.Sampler', FlakySampler)
+    @patch.dict('submission.EXECUTION_MODES', {'batch': FakeBatch})
+    def test_should_close_the_batch_and_resubmit_only_unsent_pubs(self):
+        # given
+        backend = FakeManilaV2()
+        submission = HardwareSubmission(backend, max_pubs_per_job=1)
+        run_folder = create_artifacts_folder('ghz-2q')
+        for label in ['k-0', 'k-1', 'k-2']:
+            submission.add('ghz-2q', run_folder, ghz_circuit(2), 100, label)
+        with self.assertRaises(ConnectionError):
+            submission.submit()
+
+        # when
+        submitted = submission.submit()
+
+        # then
+        self.assertEqual(FakeBatch.closed, 2)
+        self.assertEqual(
+            [job.job_id() for job, _ in submitted], ['job-3', 'job-4'])
+        self.assertEqual(
+            [pub['label'] for record in load_job_records(run_folder)
+             for pub in record['pubs']], ['k-0', 'k-1', 'k-2'])
+        self.assertEqual(submission.requests, [])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+from os import utime
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from qiskit import QuantumCircuit
+
+from transpile_cache import TranspileCache, cache_key
+
+
+def bell_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure_all()
+    return circuit
+
+
+class TestTranspileCache(TestCase):
+
+    def test_should_hash_key_parts_deterministically(self):
+        # when
+        key = cache_key(boolean_expr='x & y', iterations=1, seed_transpiler=7)
+        same_key = cache_key(seed_transpiler=7, iterations=1, boolean_expr='x & y')
+        other_key = cache_key(boolean_expr='x & y', iterations=2, seed_transpiler=7)
+
+        # then
+        self.assertEqual(key, same_key)
+        self.assertNotEqual(key, other_key)
+
+    def test_should_transpile_only_on_miss(self):
+        # given
+        calls = []
+
+        def transpile_function():
+            calls.append(1)
+            return bell_circuit()
+
+        with TemporaryDirectory() as path:
+            cache = TranspileCache(path)
+
+            # when
+            first = cache.get_or_transpile('key', transpile_function)
+            second = cache.get_or_transpile('key', transpile_function)
+
+            # then
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(first, second)
+            self.assertEqual(cache.stats['hits'], 1)
+            self.assertEqual(cache.stats['misses'], 1)
+
+    def test_should_evict_least_recently_used_entry(self):
+        with TemporaryDirectory() as path:
+            # given
+            cache = TranspileCache(path)
+            cache.put('old', bell_circuit())
+            cache.put('new', bell_circuit())
+            utime(cache._entry_path('old'), (0, 0))
+            cache.max_bytes = cache._entry_path('new').stat().st_size
+
+            # when
+            cache.evict()
+
+            # then
+            self.assertIsNone(cache.get('old'))
+            self.assertIsNotNone(cache.get('new'))
+            self.assertEqual(cache.stats['evictions'], 1)
+
+    def test_should_drop_a_truncated_entry_as_a_miss(self):
+        with TemporaryDirectory() as path:
+            # given
+            cache = TranspileCache(path)
+            cache.put('key', bell_circuit())
+            entry_path = cache._entry_path('key')
+            entry_path.write_bytes(entry_path.read_bytes()[:40])
+
+            # when
+            circuit = cache.get('key')
+
+            # then
+            self.assertIsNone(circuit)
+            self.assertFalse(entry_path.exists())
+            self.assertEqual(cache.stats['misses'], 1)
+            self.assertEqual(list(cache.path.iterdir()), [])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+from unittest import TestCase, main
+
+from qiskit import QuantumCircuit, transpile
+from qiskit_ibm_runtime.fake_provider.backends import FakeManilaV2
+
+from profiler import default_profiler
+from transpile_search import best_transpile, score_circuit, score_key
+
+
+def ghz_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(4)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.cx(0, 2)
+    circuit.cx(0, 3)
+    circuit.measure_all()
+    return circuit
+
+
+class TestTranspileSearch(TestCase):
+
+    def test_should_score_two_qubit_gates_and_error(self):
+        # given
+        backend = FakeManilaV2()
+        circuit = transpile(ghz_circuit(), backend=backend, seed_transpiler=1)
+        circuit.barrier(0, 1)
+
+        # when
+        score = score_circuit(circuit, backend.target)
+
+        # then
+        self.assertEqual(
+            score['two_qubit_gates'], circuit.count_ops().get('cx', 0))
+        self.assertGreater(score['estimated_error'], 0)
+        self.assertLess(score['estimated_error'], 1)
+
+    def test_should_keep_the_best_scored_seed(self):
+        # given
+        backend = FakeManilaV2()
+        seeds = [0, 1, 2]
+
+        # when
+        search_result = best_transpile(
+            ghz_circuit(), backend, seeds, max_workers=2)
+
+        # then
+        self.assertEqual(len(search_result['seeds']), len(seeds))
+        best_key = min(score_key(s['score']) for s in search_result['seeds'])
+        self.assertEqual(score_key(search_result['score']), best_key)
+        search_span = next(
+            s for s in reversed(default_profiler.spans)
+            if s['name'] == 'transpile_search')
+        self.assertEqual(search_span['attributes']['seeds'], search_result['seeds'])
+        self.assertEqual(
+            search_span['attributes']['best_seed'], search_result['seed'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Content-addressed on-disk cache for transpiled circuits (QPY files)
+"""
+from hashlib import sha256
+from os import environ, replace, utime
+from pathlib import Path
+from tempfile import mkstemp
+from typing import TypedDict
+
+import qiskit
+from qiskit import QuantumCircuit, qpy
+
+DEFAULT_CACHE_PATH = environ.get('TRANSPILE_CACHE_PATH', '.cache/transpiled')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class TranspileCacheStats(TypedDict):
+    hits: int
+    misses: int
+    evictions: int
+
+
+def cache_key(**key_parts) -> str:
+    """
+    Hashes the key parts (e.g. boolean expression, iterations, backend
+        fingerprint, optimization level, seed) plus the qiskit version
+    """
+    key_parts['qiskit_version'] = qiskit.__version__
+    content = ';'.join(
+        f'{name}={value!r}' for name, value in sorted(key_parts.items()))
+    return sha256(content.encode()).hexdigest()
+
+
+class TranspileCache:
+
+    path: Path
+    max_bytes: int
+    stats: TranspileCacheStats
+
+    def __init__(
+            self, path: str = DEFAULT_CACHE_PATH,
+            max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.stats = TranspileCacheStats(hits=0, misses=0, evictions=0)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f'{key}.qpy'
+
+    def get(self, key: str) -> QuantumCircuit | None:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as file:
+                circuit = qpy.load(file)[0]
+        except FileNotFoundError:
+            self.stats['misses'] += 1
+            return None
+        except Exception:  # pylint: disable=broad-except
+            # truncated or corrupt entry (QpyError, EOFError, struct.error,
+            #   ...): a miss, rewritten by the next put
+            entry_path.unlink(missing_ok=True)
+            self.stats['misses'] += 1
+            return None
+        utime(entry_path)  # LRU: mtime is the last access time
+        self.stats['hits'] += 1
+        return circuit
+
+    def put(self, key: str, circuit: QuantumCircuit):
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        # a unique temp file per writer, then an atomic rename: concurrent
+        #   writers of the same key never interleave their bytes
+        tmp_file, tmp_path = mkstemp(dir=self.path, suffix='.tmp')
+        with open(tmp_file, 'wb') as file:
+            qpy.dump(circuit, file)
+        replace(tmp_path, entry_path)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache fits max_bytes
+        """
+        entries = []
+        for entry_path in self.path.glob('*.qpy'):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def get_or_transpile(self, key: str, transpile_function) -> QuantumCircuit:
+        """
+        Returns the cached circuit or calls transpile_function and caches it
+        """
+        circuit = self.get(key)
+        if circuit is None:
+            circuit = transpile_function()
+            self.put(key, circuit)
+        return circuit
+
+
+default_cache = TranspileCache()
@@ -0,0 +1,143 @@
+"""
+Multi-seed transpilation: fans seeds out over a process pool and keeps
+    the best scored circuit
+"""
+from time import perf_counter
+from typing import TypedDict
+
+from qiskit import QuantumCircuit, transpile
+from qiskit.transpiler import Target
+from qiskit_ibm_runtime.ibm_backend import Backend
+
+from process_pool import spawn_pool
+from profiler import span
+
+
+class CircuitScore(TypedDict):
+    estimated_error: float
+    two_qubit_gates: int
+    depth: int
+
+
+class SeedTranspileResult(TypedDict):
+    seed: int
+    seconds: float
+    score: CircuitScore
+
+
+class TranspileSearchResult(TypedDict):
+    circuit: QuantumCircuit
+    seed: int
+    score: CircuitScore
+    seeds: list[SeedTranspileResult]
+    wall_seconds: float
+
+
+def score_circuit(circuit: QuantumCircuit, target: Target) -> CircuitScore:
+    """
+    Scores a transpiled circuit by the error estimated from the target
+        instruction properties (1 - product of fidelities), its two-qubit
+        gate count and depth
+    """
+    fidelity = 1.0
+    two_qubit_gates = 0
+    for instruction in circuit.data:
+        if getattr(instruction.operation, '_directive', False):
+            continue  # barriers: not gates, no error
+        name = instruction.operation.name
+        qargs = tuple(circuit.find_bit(q).index for q in instruction.qubits)
+        if len(qargs) == 2:
+            two_qubit_gates += 1
+        if name not in target:
+            continue
+        properties = target[name].get(qargs)
+        if properties is not None and properties.error is not None:
+            fidelity *= 1 - properties.error
+
+    return CircuitScore(
+        estimated_error=1 - fidelity,
+        two_qubit_gates=two_qubit_gates,
+        depth=circuit.depth())
+
+
+def score_key(score: CircuitScore) -> tuple:
+    return score['estimated_error'], score['two_qubit_gates'], score['depth']
+
+
+def transpile_to_target(
+        circuit: QuantumCircuit, target: Target, optimization_level: int,
+        seed: int | None) -> QuantumCircuit:
+    """
+    The one transpile call of both the single and multi-seed paths: the
+        target pickles into the workers, where a runtime backend may not
+    """
+    return transpile(
+        circuit, target=target, optimization_level=optimization_level,
+        seed_transpiler=seed)
+
+
+def _transpile_with_seed(
+        circuit: QuantumCircuit, target: Target,
+        optimization_level: int, seed: int):
+    start_time = perf_counter()
+    transpiled_circuit = transpile_to_target(
+        circuit, target, optimization_level, seed)
+    seconds = perf_counter() - start_time
+    return transpiled_circuit, seconds, score_circuit(transpiled_circuit, target)
+
+
+def best_transpile(
+        circuit: QuantumCircuit, backend: Backend, seeds: list[int],
+        optimization_level: int = 3,
+        max_workers: int | None = None) -> TranspileSearchResult:
+    """
+    Transpiles the circuit once per seed in a process pool and returns
+        the best scored circuit along with per-seed timings and scores,
+        also recorded on a 'transpile_search' span for the run profile
+    """
+    target = backend.target
+    with span('transpile_search', num_seeds=len(seeds)) as attributes:
+        start_time = perf_counter()
+        with spawn_pool(max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _transpile_with_seed, circuit, target,
+                    optimization_level, seed)
+                for seed in seeds
+            ]
+            results = [future.result() for future in futures]
+        wall_seconds = perf_counter() - start_time
+
+        seed_results = [
+            SeedTranspileResult(seed=seed, seconds=seconds, score=score)
+            for seed, (_, seconds, score) in zip(seeds, results)
+        ]
+        best_index = min(
+            range(len(seeds)),
+            key=lambda i: score_key(seed_results[i]['score']))
+        attributes.update(
+            best_seed=seeds[best_index], wall_seconds=wall_seconds,
+            seeds=seed_results)
+
+    return TranspileSearchResult(
+        circuit=results[best_index][0],
+        seed=seeds[best_index],
+        score=seed_results[best_index]['score'],
+        seeds=seed_results,
+        wall_seconds=wall_seconds)
+
+
+def print_search_timings(search_result: TranspileSearchResult):
+    """
+    Prints per-seed timings; sum(seconds) / wall_seconds is the speedup
+        the process pool bought
+    """
+    for seed_result in search_result['seeds']:
+        score = seed_result['score']
+        print(f'seed {seed_result["seed"]}: {seed_result["seconds"]:.2f}s '
+              f'2q={score["two_qubit_gates"]} depth={score["depth"]} '
+              f'error={score["estimated_error"]:.4f}')
+    cpu_seconds = sum(s['seconds'] for s in search_result['seeds'])
+    print(f'best seed {search_result["seed"]}: '
+          f'{search_result["wall_seconds"]:.2f}s wall, '
+          f'{cpu_seconds:.2f}s summed ({cpu_seconds / search_result["wall_seconds"]:.1f}x)')
@@ -1,11 +1,14 @@
 """
 Helper functions
 """
-from time import time
+from functools import wraps
+from time import perf_counter_ns
 
 import simplejson
 from qiskit import QuantumCircuit
-from qiskit.visualization import plot_histogram
+
+from counts import Counts
+from profiler import span
 
 
 def draw(circuit: QuantumCircuit, file_name: str):
@@ -25,6 +28,10 @@ def plot(counts: dict, file_name: str, legend = None):
     """
     Plot histogram into a PNG file
     """
+    # imported here: qiskit.visualization is slow to load and only
+    #   rendering needs it
+    from qiskit.visualization import plot_histogram
+
     plot_histogram(
         counts,
         figsize=(15, 20),
@@ -44,27 +51,30 @@ def write_job_results_json(counts: dict, file_name: str):
             counts, default=lambda o: o.__dict__,
             fp=file, indent=4, sort_keys=True)
 
-def write_results_csv(counts: dict, file_name: str):
+def write_results_csv(counts, file_name: str):
     """
-    write counts into file as CSV
+    write counts (a dict or Counts) into file as CSV, line by line
     """
-    header = 'cbits,counts\n'
-    lines = ''.join([
-        f'{cbits},{count}\n'
-        for cbits, count in sorted(counts.items())
-    ])
-    content = header + lines
-    
+    items = counts.items() if isinstance(counts, Counts) \
+        else sorted(counts.items())
+
     file_name = f'{file_name}.counts.csv'
     with open(file_name, 'w', encoding='utf-8') as file:
-        file.write(content)
+        file.write('cbits,counts\n')
+        file.writelines(f'{cbits},{count}\n' for cbits, count in items)
 
 
 def print_exec_time(function):
+    """
+    Runs the function inside a profiler span (see profiler.py) and prints
+        its wall time
+    """
+    @wraps(function)
     def wrapper(*args, **kwargs):
-        start_time = time()
-        result = function(*args, **kwargs)
-        elapsed_time = round(time() - start_time)
-        print(f'{function.__name__}: {elapsed_time}s')
+        start_ns = perf_counter_ns()
+        with span(function.__name__):
+            result = function(*args, **kwargs)
+        elapsed_time = (perf_counter_ns() - start_ns) / 1e9
+        print(f'{function.__name__}: {elapsed_time:.3f}s')
         return result
     return wrapper